@@ -0,0 +1,37 @@
+'''
+Compare the client-side cost of a registry `resolver(node)` read through web3's ConciseContract
+with the raw eth_call of ens.fastpath, against a provider that answers instantly
+
+Run from the repository root, after `pip install -e .`: python benchmarks/eth_call.py
+'''
+import timeit
+
+from web3.providers.base import BaseProvider
+
+from ens import ENS
+from ens.utils import label_to_hash
+
+NODE = label_to_hash('jasoncarver')
+RESOLVER = '0x' + '0' * 24 + '5ffc014343cd971b7eb70732021e26c35b744cc4'
+ROUNDS = 2000
+
+
+class InstantProvider(BaseProvider):
+    def make_request(self, method, params):
+        if method == 'eth_getBlockByNumber':
+            return {'result': {'number': '0x1', 'timestamp': '0x7fffffff'}}
+        return {'result': RESOLVER}
+
+
+def report(name, stmt):
+    seconds = min(timeit.repeat(stmt, number=ROUNDS, repeat=3))
+    print("%-32s %6.1f us/call" % (name, seconds / ROUNDS * 1e6))
+
+
+if __name__ == '__main__':
+    ens = ENS(InstantProvider())
+    contract = ens.ens._contract
+    assert contract.resolver(NODE) == ens.ens.resolver(NODE)
+
+    report('resolver, ConciseContract', lambda: contract.resolver(NODE))
+    report('resolver, raw eth_call', lambda: ens.ens.resolver(NODE))
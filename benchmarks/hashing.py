@@ -0,0 +1,34 @@
+'''
+Compare the cost of each hash via web3's hex-string sha3 with the bytes-native keccak in ens.utils
+
+Run from the repository root, after `pip install -e .`: python benchmarks/hashing.py
+'''
+import timeit
+
+from web3 import Web3
+
+from ens.constants import EMPTY_SHA3_BYTES
+from ens.utils import keccak, label_to_hash
+
+LABEL = 'jasoncarver'
+NODE_INPUT = EMPTY_SHA3_BYTES + label_to_hash('eth')
+ROUNDS = 100000
+
+
+def hex_sha3(data):
+    return Web3.toBytes(hexstr=Web3.sha3(data))
+
+
+def report(name, stmt):
+    seconds = min(timeit.repeat(stmt, number=ROUNDS, repeat=3))
+    print("%-32s %6.2f us/hash" % (name, seconds / ROUNDS * 1e6))
+
+
+if __name__ == '__main__':
+    assert hex_sha3(LABEL.encode()) == label_to_hash(LABEL)
+    assert hex_sha3(NODE_INPUT) == keccak(NODE_INPUT)
+
+    report('labelhash, Web3.sha3 + toBytes', lambda: hex_sha3(LABEL.encode()))
+    report('labelhash, keccak', lambda: label_to_hash(LABEL))
+    report('node, Web3.sha3 + toBytes', lambda: hex_sha3(NODE_INPUT))
+    report('node, keccak', lambda: keccak(NODE_INPUT))
@@ -0,0 +1,35 @@
+'''
+Measure how long a fresh interpreter takes to `import ens`, and how much of the cost of
+building the default ENS instance is deferred until first use
+
+Run from the repository root, after `pip install -e .`: python benchmarks/import_time.py
+'''
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+ROUNDS = 20
+
+
+def run(code):
+    start = time.perf_counter()
+    subprocess.check_call([sys.executable, '-c', code])
+    return time.perf_counter() - start
+
+
+def report(name, code):
+    seconds = statistics.median(run(code) for _ in range(ROUNDS))
+    print("%-40s %7.1f ms" % (name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    report('python startup', 'pass')
+    report('import web3', 'import web3')
+    report('import ens', 'import ens')
+    report('import ens, then use the default ens', 'import ens; ens.ens.web3')
+
+    from ens import ENS
+    seconds = min(timeit.repeat(ENS, number=1, repeat=ROUNDS))
+    print("%-40s %7.1f ms" % ('build the default ENS, in process', seconds * 1e3))
@@ -1,5 +1,7 @@
 # flake8: noqa
 
 from .main import *
+from .utils import Lazy
 
-ens = ENS()
+# built on first use, so importing ens doesn't connect to a node or load contract ABIs
+ens = Lazy(ENS)
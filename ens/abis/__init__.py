@@ -0,0 +1,68 @@
+'''
+The ABIs of the ENS contracts, like `abis.RESOLVER`. Each one is parsed from its JSON file the
+first time it is used, so importing ens doesn't pay for ABIs it never needs.
+
+Function selectors and event topics are precomputed in :mod:`ens.abis.tables`. After changing a
+JSON file, regenerate them with: python -m ens.abis
+'''
+import json
+import pkgutil
+import sys
+import types
+
+from eth_utils import keccak
+
+CONTRACTS = (
+    'AUCTION_REGISTRAR',
+    'DEED',
+    'ENS',
+    'FIFS_REGISTRAR',
+    'RESOLVER',
+    'REVERSE_REGISTRAR',
+)
+
+
+def load(contract):
+    '@returns the ABI of `contract`, like \'RESOLVER\', parsed from its JSON file'
+    return json.loads(pkgutil.get_data(__name__, '%s.json' % contract.lower()).decode())
+
+
+def signature(entry):
+    '@returns the canonical signature of a function or event in an ABI, like \'addr(bytes32)\''
+    return '%s(%s)' % (entry['name'], ','.join(arg['type'] for arg in entry['inputs']))
+
+
+def selector_table(abi):
+    '@returns a dict of each function signature in `abi` to its 4-byte selector'
+    return {
+        signature(entry): keccak(signature(entry).encode())[:4]
+        for entry in abi
+        if entry['type'] == 'function'
+    }
+
+
+def topic_table(abi):
+    '@returns a dict of each event signature in `abi` to its 32-byte topic'
+    return {
+        signature(entry): keccak(signature(entry).encode())
+        for entry in abi
+        if entry['type'] == 'event'
+    }
+
+
+class _ABIModule(types.ModuleType):
+    # python 3.5 and 3.6 have no module-level __getattr__, so the module gets this class instead
+
+    def __getattr__(self, attr):
+        if attr not in CONTRACTS:
+            raise AttributeError("module %r has no attribute %r" % (self.__name__, attr))
+        abi = load(attr)
+        # later lookups find it in the module, without calling __getattr__
+        setattr(self, attr, abi)
+        return abi
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(CONTRACTS))
+
+
+sys.modules[__name__].__class__ = _ABIModule
@@ -0,0 +1,44 @@
+'''
+Regenerate ens/abis/tables.py from the JSON ABIs: python -m ens.abis
+'''
+import os
+
+from web3 import Web3
+
+from ens.abis import CONTRACTS, load, selector_table, topic_table
+
+MAX_LINE_LENGTH = 100
+
+HEADER = """'''
+Function selectors and event topics of each ENS contract, by signature, as hex
+
+Generated from the JSON ABIs by: python -m ens.abis -- do not edit
+'''
+"""
+
+
+def render(name, tables):
+    lines = ['%s = {' % name]
+    for contract in sorted(tables):
+        lines.append('    %r: {' % contract)
+        for signature, value in sorted(tables[contract].items()):
+            line = '        %r: %r,' % (signature, Web3.toHex(value))
+            if len(line) > MAX_LINE_LENGTH:
+                line = '        %r:\n            %r,' % (signature, Web3.toHex(value))
+            lines.append(line)
+        lines.append('    },')
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def tables_source():
+    abis = {contract: load(contract) for contract in CONTRACTS}
+    selectors = {contract: selector_table(abi) for contract, abi in abis.items()}
+    topics = {contract: topic_table(abi) for contract, abi in abis.items()}
+    return '\n'.join([HEADER, render('SELECTORS', selectors), render('TOPICS', topics)])
+
+
+if __name__ == '__main__':
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tables.py')
+    with open(path, 'w') as tables:
+        tables.write(tables_source())
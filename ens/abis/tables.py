@@ -0,0 +1,127 @@
+'''
+Function selectors and event topics of each ENS contract, by signature, as hex
+
+Generated from the JSON ABIs by: python -m ens.abis -- do not edit
+'''
+
+SELECTORS = {
+    'AUCTION_REGISTRAR': {
+        'acceptRegistrarTransfer(bytes32,address,uint256)': '0xea9e107a',
+        'cancelBid(address,bytes32)': '0x2525f5c1',
+        'ens()': '0x3f15457f',
+        'entries(bytes32)': '0x267b6922',
+        'eraseNode(bytes32[])': '0xde10f04b',
+        'finalizeAuction(bytes32)': '0x983b94fb',
+        'getAllowedTime(bytes32)': '0x13c89a8f',
+        'invalidateName(string)': '0x15f73331',
+        'isAllowed(bytes32,uint256)': '0x93503337',
+        'launchLength()': '0xae1a0b0c',
+        'newBid(bytes32)': '0xce92dced',
+        'registryStarted()': '0x9c67f06f',
+        'releaseDeed(bytes32)': '0x0230a07c',
+        'rootNode()': '0xfaff50a8',
+        'sealedBids(address,bytes32)': '0x5e431709',
+        'shaBid(bytes32,address,uint256,bytes32)': '0x22ec1244',
+        'startAuction(bytes32)': '0xede8acdb',
+        'startAuctions(bytes32[])': '0xe27fe50f',
+        'startAuctionsAndBid(bytes32[],bytes32)': '0xfebefd61',
+        'state(bytes32)': '0x61d585da',
+        'transfer(bytes32,address)': '0x79ce9fac',
+        'transferRegistrars(bytes32)': '0x5ddae283',
+        'unsealBid(bytes32,uint256,bytes32)': '0x47872b42',
+    },
+    'DEED': {
+        'closeDeed(uint256)': '0xbbe42771',
+        'creationDate()': '0x05b34410',
+        'destroyDeed()': '0x0b5ab3d5',
+        'owner()': '0x8da5cb5b',
+        'registrar()': '0x2b20e397',
+        'setBalance(uint256)': '0xfb1669ca',
+        'setOwner(address)': '0x13af4035',
+        'setRegistrar(address)': '0xfaab9d39',
+    },
+    'ENS': {
+        'owner(bytes32)': '0x02571be3',
+        'resolver(bytes32)': '0x0178b8bf',
+        'setOwner(bytes32,address)': '0x5b0fc9c3',
+        'setResolver(bytes32,address)': '0x1896f70a',
+        'setSubnodeOwner(bytes32,bytes32,address)': '0x06ab5923',
+        'setTTL(bytes32,uint64)': '0x14ab9038',
+        'ttl(bytes32)': '0x16a25cbd',
+    },
+    'FIFS_REGISTRAR': {
+        'ens()': '0x3f15457f',
+        'expiryTimes(bytes32)': '0xaf9f26e4',
+        'register(bytes32,address)': '0xd22057a9',
+        'rootNode()': '0xfaff50a8',
+    },
+    'RESOLVER': {
+        'ABI(bytes32,uint256)': '0x2203ab56',
+        'addr(bytes32)': '0x3b3b57de',
+        'content(bytes32)': '0x2dff6941',
+        'name(bytes32)': '0x691f3431',
+        'pubkey(bytes32)': '0xc8690233',
+        'setABI(bytes32,uint256,bytes)': '0x623195b0',
+        'setAddr(bytes32,address)': '0xd5fa2b00',
+        'setContent(bytes32,bytes32)': '0xc3d014d6',
+        'setName(bytes32,string)': '0x77372213',
+        'setPubkey(bytes32,bytes32,bytes32)': '0x29cd62ea',
+        'supportsInterface(bytes4)': '0x01ffc9a7',
+    },
+    'REVERSE_REGISTRAR': {
+        'claim(address)': '0x1e83409a',
+        'claimWithResolver(address,address)': '0x0f5a5466',
+        'defaultResolver()': '0x828eab0e',
+        'ens()': '0x3f15457f',
+        'node(address)': '0xbffbe61c',
+        'setName(string)': '0xc47f0027',
+    },
+}
+
+TOPICS = {
+    'AUCTION_REGISTRAR': {
+        'AuctionStarted(bytes32,uint256)':
+            '0x87e97e825a1d1fa0c54e1d36c7506c1dea8b1efd451fe68b000cf96f7cf40003',
+        'BidRevealed(bytes32,address,uint256,uint8)':
+            '0x7b6c4b278d165a6b33958f8ea5dfb00c8c9d4d0acf1985bef5d10786898bc3e7',
+        'HashInvalidated(bytes32,string,uint256,uint256)':
+            '0x1f9c649fe47e58bb60f4e52f0d90e4c47a526c9f90c5113df842c025970b66ad',
+        'HashRegistered(bytes32,address,uint256,uint256)':
+            '0x0f0c27adfd84b60b6f456b0e87cdccb1e5fb9603991588d87fa99f5b6b61e670',
+        'HashReleased(bytes32,uint256)':
+            '0x292b79b9246fa2c8e77d3fe195b251f9cb839d7d038e667c069ee7708c631e16',
+        'NewBid(bytes32,address,uint256)':
+            '0xb556ff269c1b6714f432c36431e2041d28436a73b6c3f19c021827bbdc6bfc29',
+    },
+    'DEED': {
+        'DeedClosed()': '0xbb2ce2f51803bba16bc85282b47deeea9a5c6223eabea1077be696b3f265cf13',
+        'OwnerChanged(address)':
+            '0xa2ea9883a321a3e97b8266c2b078bfeec6d50c711ed71f874a90d500ae2eaf36',
+    },
+    'ENS': {
+        'NewOwner(bytes32,bytes32,address)':
+            '0xce0457fe73731f824cc272376169235128c118b49d344817417c6d108d155e82',
+        'NewResolver(bytes32,address)':
+            '0x335721b01866dc23fbee8b6b2c7b1e14d6f05c28cd35a2c934239f94095602a0',
+        'NewTTL(bytes32,uint64)':
+            '0x1d4f9bbfc9cab89d66e1a1562f2233ccbf1308cb4f63de2ead5787adddb8fa68',
+        'Transfer(bytes32,address)':
+            '0xd4735d920b0f87494915f556dd9b54c8f309026070caea5c737245152564d266',
+    },
+    'FIFS_REGISTRAR': {
+    },
+    'RESOLVER': {
+        'ABIChanged(bytes32,uint256)':
+            '0xaa121bbeef5f32f5961a2a28966e769023910fc9479059ee3495d4c1a696efe3',
+        'AddrChanged(bytes32,address)':
+            '0x52d7d861f09ab3d26239d492e8968629f95e9e318cf0b73bfddc441522a15fd2',
+        'ContentChanged(bytes32,bytes32)':
+            '0x0424b6fe0d9c3bdbece0e7879dc241bb0c22e900be8b6c168b4ee08bd9bf83bc',
+        'NameChanged(bytes32,string)':
+            '0xb7d29e911041e8d9b843369e890bcb72c9388692ba48b65ac54e7214c4c348f7',
+        'PubkeyChanged(bytes32,bytes32,bytes32)':
+            '0x1d6f5e03d3f63eb58751986629a5439baee5079ff04f345becb66e23eb154e46',
+    },
+    'REVERSE_REGISTRAR': {
+    },
+}
@@ -0,0 +1,203 @@
+'''
+An asyncio-native ENS client, for resolving many names concurrently on one event loop
+
+It talks JSON-RPC over HTTP with aiohttp, which is an optional dependency: `pip install ens[async]`
+'''
+import asyncio
+from datetime import datetime
+import itertools
+
+import pytz
+from web3 import Web3
+
+from ens.abis import tables
+from ens.batch import NODE_DECODERS, node_call, unwrap, words
+from ens.coalesce import AsyncSingleFlight
+from ens.constants import NAMEHASH_CACHE_SIZE
+from ens.main import ENS, ENS_MAINNET_ADDR
+from ens.middleware import FreshnessMonitor
+from ens.registrar import REGISTRAR_NAME, AuctionEntries, Registrar, Status
+from ens.utils import LRUCache
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ENTRIES_SELECTOR = Web3.toBytes(
+    hexstr=tables.SELECTORS['AUCTION_REGISTRAR']['entries(bytes32)'],
+)
+
+
+class AsyncHTTPProvider:
+    '''
+    Sends JSON-RPC requests over HTTP, reusing the connections of one aiohttp session
+    '''
+
+    def __init__(self, endpoint_uri='http://localhost:8545', session=None, request_kwargs=None):
+        '''
+        @param session an optional aiohttp.ClientSession, which is then not closed by :meth:`close`
+        @param request_kwargs extra keyword arguments for each aiohttp request, like `timeout`
+        '''
+        if aiohttp is None:
+            raise ImportError("AsyncENS needs aiohttp. Install it with: pip install ens[async]")
+        self.endpoint_uri = endpoint_uri
+        self._session = session
+        self._owns_session = session is None
+        self._request_kwargs = request_kwargs or {}
+        self._ids = itertools.count()
+
+    async def make_request(self, method, params):
+        '@returns the JSON-RPC response, as a dict'
+        if self._session is None:
+            # sessions must be created inside the event loop
+            self._session = aiohttp.ClientSession()
+        request = {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': next(self._ids)}
+        async with self._session.post(
+                self.endpoint_uri,
+                json=request,
+                **self._request_kwargs) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncENS:
+    '''
+    Look up ENS names with coroutines, like :class:`~ens.main.ENS` does with blocking calls:
+    `await ens.address('jasoncarver.eth')`
+
+    Only reads are supported. Resolvers are returned as their address.
+    '''
+
+    def __init__(self, provider=None, addr=None):
+        '''
+        @param provider is an object with a coroutine `make_request(method, params)`, like
+            :class:`AsyncHTTPProvider`, which is the default
+        @param addr is the address of the ENS registry on-chain. If not provided,
+            ENS.py will default to the mainnet ENS registry address.
+        '''
+        self.provider = provider if provider else AsyncHTTPProvider()
+        self._ens_addr = addr if addr else ENS_MAINNET_ADDR
+        self.registrar = AsyncRegistrar(self)
+        self._nodes = LRUCache(NAMEHASH_CACHE_SIZE)
+        self.freshness = FreshnessMonitor()
+        self._flights = AsyncSingleFlight()
+        self._latest_block = None
+
+    async def address(self, name):
+        return await self.resolve(name, 'addr')
+
+    async def name(self, address):
+        reversed_domain = self.reverse_domain(address)
+        return await self.resolve(reversed_domain, get='name')
+    reverse = name
+
+    async def resolve(self, name, get='addr'):
+        node = self.namehash(name)
+        return await self._flights.do(('resolve', node, get), self._lookup, node, get)
+
+    async def resolver(self, name):
+        '@returns the address of the resolver of `name`, or None if it has none'
+        node = self.namehash(name)
+        return await self._flights.do(('resolver', node), self._registry_call, 'resolver', node)
+
+    async def owner(self, name):
+        node = self.namehash(name)
+        return await self._flights.do(('owner', node), self._registry_call, 'owner', node)
+
+    async def close(self):
+        if hasattr(self.provider, 'close'):
+            await self.provider.close()
+
+    # hashing and normalization are shared with ENS
+    namehash = ENS.namehash
+    namehash_chain = ENS.namehash_chain
+    labelhash = ENS.labelhash
+    reverse_domain = ENS.reverse_domain
+    nameprep = staticmethod(ENS.nameprep)
+    _full_name = staticmethod(ENS._full_name)
+
+    async def _lookup(self, node, get):
+        resolver = await self._registry_call('resolver', node)
+        if resolver:
+            return await self._node_call(resolver, get, node)
+        else:
+            return None
+
+    async def _registry_call(self, function, node):
+        await self._assert_fresh()
+        return await self._node_call(self._ens_addr, function, node)
+
+    async def _node_call(self, contract_address, function, node):
+        result = await self._request(*node_call(contract_address, function, node))
+        return NODE_DECODERS[function](result)
+
+    async def _request(self, method, params):
+        return unwrap(await self.provider.make_request(method, params))
+
+    async def _assert_fresh(self):
+        '''
+        Check that the chain is not stale, like the stalecheck middleware of ENS. The latest
+        block is only requested when the freshness monitor is due, and concurrent lookups share
+        that request.
+        '''
+        latest_block = self._latest_block
+        if latest_block is None or latest_block.done():
+            latest_block = None
+            if self.freshness.due():
+                latest_block = asyncio.ensure_future(self._observe_latest_block())
+                self._latest_block = latest_block
+        if latest_block is not None:
+            await latest_block
+        self.freshness.assert_fresh()
+
+    async def _observe_latest_block(self):
+        block = await self.provider.make_request('eth_getBlockByNumber', ['latest', False])
+        self.freshness.observe(unwrap(block))
+
+
+class AsyncRegistrar:
+    '''
+    Read auction entries with coroutines, like :class:`~ens.registrar.Registrar`.
+    Deeds are returned as their address.
+    '''
+
+    def __init__(self, ens):
+        self.ens = ens
+        self._core_addr = None
+        self._short_invalid = True
+
+    async def entries(self, label):
+        label = self._to_label(label)
+        label_hash = self.ens.labelhash(label)
+        return await self.entries_by_hash(label_hash)
+
+    async def entries_by_hash(self, label_hash):
+        '''
+        @returns a 5-item collection, like :meth:`ens.registrar.Registrar.entries_by_hash`
+        '''
+        assert isinstance(label_hash, (bytes, bytearray))
+        core = await self._core()
+        await self.ens._assert_fresh()
+        data = Web3.toHex(ENTRIES_SELECTOR + label_hash)
+        result = await self.ens._request('eth_call', [{'to': core, 'data': data}, 'latest'])
+        entries = [int(word, 16) for word in words(result, 5)]
+        return AuctionEntries(
+            Status(entries[0]),
+            Web3.toChecksumAddress('0x%040x' % entries[1]) if entries[1] else None,
+            datetime.fromtimestamp(entries[2], pytz.utc) if entries[2] else None,
+            entries[3],
+            entries[4],
+            )
+
+    _to_label = Registrar._to_label
+
+    async def _core(self):
+        if not self._core_addr:
+            self._core_addr = await self.ens.owner(REGISTRAR_NAME)
+        return self._core_addr
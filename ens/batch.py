@@ -0,0 +1,279 @@
+'''
+Read from contracts in as few round trips as possible, using JSON-RPC batch requests
+
+Only the common reads are supported: functions that take a single bytes32 node, like
+`owner(bytes32)` in the registry and `addr(bytes32)` in a resolver.
+'''
+from collections import OrderedDict
+import json
+import time
+
+from eth_utils import force_bytes, force_text
+from web3 import HTTPProvider, IPCProvider, Web3
+from web3.utils.compat import Timeout, make_post_request, socket
+
+from ens.abis import tables
+from ens.instrument import record_rpc
+from ens.middleware import FreshnessMonitor
+from ens.utils import to_address
+
+
+NODE_FUNCTIONS = ('addr', 'content', 'name', 'owner', 'pubkey', 'resolver', 'ttl')
+
+# registry and resolver selectors, from the precomputed tables
+_SIGNATURES = dict(tables.SELECTORS['RESOLVER'], **tables.SELECTORS['ENS'])
+
+SELECTORS = {fn: Web3.toBytes(hexstr=_SIGNATURES['%s(bytes32)' % fn]) for fn in NODE_FUNCTIONS}
+
+# the resolver's ABI record also takes the content types that the caller accepts
+SELECTORS['ABI'] = Web3.toBytes(hexstr=_SIGNATURES['ABI(bytes32,uint256)'])
+
+
+def node_call(contract_address, function, node, *uints, block_identifier='latest'):
+    '''
+    @param uints any arguments after the node, which must all be uint256
+    @returns the (method, params) of an eth_call to `function(node)` at `contract_address`
+    '''
+    data = Web3.toHex(SELECTORS[function] + node + b''.join(
+        uint.to_bytes(32, 'big') for uint in uints
+    ))
+    return ('eth_call', [{'to': contract_address, 'data': data}, block_identifier])
+
+
+def decode_address(result):
+    '''
+    @param result the hex result of an eth_call that returns an address
+    @returns the checksummed address, or None for the zero address, like ConciseContract
+    '''
+    word = words(result, 1)
+    if word is None or not int(word[0], 16):
+        return None
+    return to_address(word[0][-40:]).checksum
+
+
+def decode_string(result):
+    '''
+    @param result the hex result of an eth_call that returns a string
+    @returns the str, or None if it is empty, or not valid UTF-8
+    '''
+    raw = Web3.toBytes(hexstr=result) if result else b''
+    if len(raw) < 64:
+        return None
+    offset = int.from_bytes(raw[:32], 'big')
+    length = int.from_bytes(raw[offset:offset + 32], 'big')
+    try:
+        return raw[offset + 32:offset + 32 + length].decode() or None
+    except UnicodeDecodeError:
+        # anyone can store any bytes, for example in the reverse record of their own address
+        return None
+
+
+def decode_bytes32(result):
+    '@returns the bytes32 result of an eth_call as bytes, or None if it is all zeros'
+    word = words(result, 1)
+    if word is None or not int(word[0], 16):
+        return None
+    return Web3.toBytes(hexstr=word[0])
+
+
+def decode_uint(result):
+    '@returns the uint result of an eth_call as an int, or None if nothing was returned'
+    word = words(result, 1)
+    return int(word[0], 16) if word else None
+
+
+def decode_abi(result):
+    '''
+    @param result the hex result of a call to ABI(node, contentTypes) in a resolver
+    @returns a (content_type, data) pair, or None if there is no ABI of the accepted types
+    '''
+    raw = Web3.toBytes(hexstr=result) if result else b''
+    if len(raw) < 64 or not int.from_bytes(raw[:32], 'big'):
+        return None
+    offset = int.from_bytes(raw[32:64], 'big')
+    length = int.from_bytes(raw[offset:offset + 32], 'big')
+    return (int.from_bytes(raw[:32], 'big'), raw[offset + 32:offset + 32 + length])
+
+
+def decode_pubkey(result):
+    '''
+    @param result the hex result of a call to pubkey(node) in a resolver
+    @returns the (x, y) coordinates as bytes, or None if there is no public key
+    '''
+    pubkey = words(result, 2)
+    if pubkey is None or not any(int(word, 16) for word in pubkey):
+        return None
+    return tuple(Web3.toBytes(hexstr=word) for word in pubkey)
+
+
+NODE_DECODERS = {
+    'ABI': decode_abi,
+    'addr': decode_address,
+    'content': decode_bytes32,
+    'name': decode_string,
+    'owner': decode_address,
+    'pubkey': decode_pubkey,
+    'resolver': decode_address,
+    'ttl': decode_uint,
+}
+
+
+def words(result, count):
+    '@returns the first `count` 32-byte words of a hex result, each as 64 hex digits'
+    hexdata = result[2:] if result and result.startswith('0x') else (result or '')
+    if len(hexdata) < 64 * count:
+        return None
+    return [hexdata[idx * 64:(idx + 1) * 64] for idx in range(count)]
+
+
+def batch_request(web3, requests, freshness=None, failed_result=None):
+    '''
+    Send many JSON-RPC requests at once, over HTTP or IPC. If the first provider can't take
+    batches, like a custom provider, send them one by one.
+
+    A batch skips the web3 middlewares, so it checks that the chain is not stale on its own.
+    When `freshness` is due, a request for the latest block is added to the same batch.
+
+    @param requests a list of (method, params) pairs
+    @param freshness a :class:`~ens.middleware.FreshnessMonitor`. Without one, the latest block
+        is requested in every batch.
+    @param failed_result if set, the result of each request that returns an error, instead of
+        raising ValueError. A batch that is rejected as a whole still raises.
+    @returns a list of results, in the same order as requests
+    '''
+    requests = list(requests)
+    if not requests:
+        return []
+    provider = web3.manager.providers[0]
+    if not _supports_batch(provider):
+        return [_request(web3, method, params, failed_result) for method, params in requests]
+
+    if freshness is None:
+        freshness = FreshnessMonitor()
+    check_latest = freshness.due()
+    if check_latest:
+        requests.insert(0, ('eth_getBlockByNumber', ['latest', False]))
+    start = time.perf_counter()
+    if hasattr(provider, 'make_batch_request'):
+        responses = provider.make_batch_request(requests)
+    elif isinstance(provider, IPCProvider):
+        responses = _ipc_batch_request(provider, requests)
+    else:
+        responses = _http_batch_request(provider, requests)
+    record_rpc(
+        'batch',
+        time.perf_counter() - start,
+        requests,
+        responses,
+        [method for method, _ in requests],
+    )
+    if check_latest:
+        freshness.observe(unwrap(responses.pop(0)))
+    results = [unwrap(response, failed_result) for response in responses]
+    freshness.assert_fresh()
+    return results
+
+
+def batch_node_calls(web3, calls, block_identifier='latest', freshness=None):
+    '''
+    Call many contract functions that each take a single node, in one batch.
+    Identical calls are only sent once.
+
+    @param calls an iterable of (contract_address, function_name, node), followed by any uint
+        arguments after the node
+    @param block_identifier the block to read at, as a hex quantity or 'latest'
+    @param freshness an optional :class:`~ens.middleware.FreshnessMonitor`, like in batch_request
+    @returns a list of the hex results, in the same order as `calls`. A call that returns an
+        error, like one that reverts on some nodes, has an empty result, which decodes to None.
+    '''
+    calls = list(calls)
+    unique_calls = list(OrderedDict.fromkeys(calls))
+    requests = [node_call(*call, block_identifier=block_identifier) for call in unique_calls]
+    results = batch_request(web3, requests, freshness, failed_result='0x')
+    results_by_call = dict(zip(unique_calls, results))
+    return [results_by_call[call] for call in calls]
+
+
+def can_batch(web3):
+    '@returns whether batch_request sends all of its requests in one round trip'
+    return _supports_batch(web3.manager.providers[0])
+
+
+def _supports_batch(provider):
+    return (
+        hasattr(provider, 'make_batch_request') or
+        isinstance(provider, (HTTPProvider, IPCProvider))
+    )
+
+
+def encode_batch(requests, first_id=0):
+    return force_bytes(json.dumps([
+        {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': first_id + idx}
+        for idx, (method, params) in enumerate(requests)
+    ]))
+
+
+def decode_batch(raw_response, first_id=0):
+    '@returns the responses sorted in request order, because nodes may reorder them'
+    responses = json.loads(force_text(raw_response))
+    if not isinstance(responses, list):
+        # a whole batch can be rejected with a single error response
+        raise ValueError(responses.get('error', responses))
+    return sorted(responses, key=lambda response: response['id'] - first_id)
+
+
+def _http_batch_request(provider, requests):
+    raw_response = make_post_request(
+        provider.endpoint_uri,
+        encode_batch(requests),
+        **provider.get_request_kwargs()
+    )
+    return decode_batch(raw_response)
+
+
+def _ipc_batch_request(provider, requests):
+    # share the socket of the provider, and its lock, with its single requests
+    with provider._lock, provider._socket as sock:
+        try:
+            sock.sendall(encode_batch(requests))
+        except BrokenPipeError:
+            # one extra attempt, like IPCProvider
+            sock = provider._socket.reset()
+            sock.sendall(encode_batch(requests))
+        return decode_batch(receive_json(sock))
+
+
+def receive_json(sock):
+    '@returns the raw bytes of one whole JSON response, read from `sock`'
+    raw_response = b''
+    with Timeout(10) as timeout:
+        while True:
+            try:
+                raw_response += sock.recv(4096)
+            except socket.timeout:
+                timeout.sleep(0)
+                continue
+            try:
+                json.loads(force_text(raw_response))
+            except ValueError:
+                # the response is not complete yet
+                timeout.sleep(0)
+            else:
+                return raw_response
+
+
+def unwrap(response, failed_result=None):
+    if 'error' in response:
+        if failed_result is not None:
+            return failed_result
+        raise ValueError(response['error'])
+    return response['result']
+
+
+def _request(web3, method, params, failed_result):
+    try:
+        return web3.manager.request_blocking(method, params)
+    except ValueError:
+        if failed_result is None:
+            raise
+        return failed_result
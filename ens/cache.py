@@ -0,0 +1,174 @@
+import threading
+import time
+
+from ens.constants import (
+    NEGATIVE_CACHE_SIZE,
+    NEGATIVE_CACHE_TTL,
+    RESOLUTION_CACHE_SIZE,
+    RESOLUTION_MAX_TTL,
+    RESOLUTION_MIN_TTL,
+)
+from ens.utils import LRUCache
+
+
+class ResolutionCache:
+    '''
+    Remembers the resolver and records of each node, for as long as the name's TTL in the registry
+    allows, bounded by `min_ttl` and `max_ttl`.
+
+    Most names leave their registry TTL at the default of 0, so `min_ttl` decides how long those
+    names are remembered. Set `min_ttl=0` to only cache names whose owners declared a TTL.
+
+    Pass one to ENS to enable caching: `ENS(provider, cache=ResolutionCache())`
+    It is safe to share between threads.
+    '''
+
+    def __init__(
+            self,
+            maxsize=RESOLUTION_CACHE_SIZE,
+            min_ttl=RESOLUTION_MIN_TTL,
+            max_ttl=RESOLUTION_MAX_TTL,
+            clock=time.monotonic):
+        '''
+        @param maxsize the number of nodes to remember, least recently used are evicted first
+        @param min_ttl the minimum number of seconds to remember a node, despite its registry TTL
+        @param max_ttl the maximum number of seconds to remember a node, despite its registry TTL
+        @param clock a function that returns the current time in seconds
+        '''
+        if min_ttl > max_ttl:
+            raise ValueError("min_ttl of %r is larger than max_ttl of %r" % (min_ttl, max_ttl))
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries = LRUCache(maxsize)
+        # nodes whose registry TTL gave them no lifetime, and when to read their TTL again
+        self._uncacheable = LRUCache(maxsize)
+        self._lock = threading.RLock()
+
+    def get(self, node, key):
+        '''
+        @param key the record to look up, like 'addr', or 'resolver' for the resolver address
+        @returns the remembered value, or None if it is not cached or has expired
+        '''
+        with self._lock:
+            entry = self._live_entry(node)
+            return entry.values.get(key) if entry else None
+
+    def needs_ttl(self, node):
+        '''
+        @returns whether :meth:`put` needs the registry TTL of `node`. It does not when the
+            lifetime is fixed, when the node is already cached, or when its TTL was recently
+            found to be too short to cache it.
+        '''
+        if self.min_ttl == self.max_ttl:
+            return False
+        with self._lock:
+            if self._live_entry(node) is not None:
+                return False
+            retry_at = self._uncacheable.get(node)
+            if retry_at is None:
+                return True
+            if retry_at <= self._clock():
+                self._uncacheable.pop(node)
+                return True
+            return False
+
+    def put(self, node, key, value, ttl=0):
+        '''
+        @param ttl the TTL of the node in the registry, in seconds. It only sets the lifetime of
+            nodes that are not cached yet; all records of a node expire together.
+        '''
+        with self._lock:
+            entry = self._live_entry(node)
+            if entry is None:
+                lifetime = min(max(ttl, self.min_ttl), self.max_ttl)
+                if not lifetime:
+                    # keep the first retry time, or frequent lookups would push it back forever
+                    if self._uncacheable.get(node) is None:
+                        self._uncacheable[node] = self._clock() + self.max_ttl
+                    return
+                entry = _Entry(self._clock() + lifetime)
+                self._entries[node] = entry
+            entry.values[key] = value
+
+    def evict(self, node):
+        self._entries.pop(node)
+        self._uncacheable.pop(node)
+
+    def clear(self):
+        self._entries.clear()
+        self._uncacheable.clear()
+
+    def __contains__(self, node):
+        with self._lock:
+            return self._live_entry(node) is not None
+
+    def _live_entry(self, node):
+        entry = self._entries.get(node)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._entries.pop(node)
+            return None
+        return entry
+
+
+class NegativeCache:
+    '''
+    Remembers which lookups found nothing: a node without a resolver, a zero address,
+    or an address without a reverse record. Misses are usually far more common than hits, so
+    they are kept apart from :class:`ResolutionCache`, with their own size and a short lifetime.
+
+    Pass one to ENS to enable it: `ENS(provider, negative_cache=NegativeCache())`
+    '''
+
+    def __init__(self, maxsize=NEGATIVE_CACHE_SIZE, ttl=NEGATIVE_CACHE_TTL, clock=time.monotonic):
+        '''
+        @param maxsize the number of nodes to remember, least recently used are evicted first
+        @param ttl the number of seconds to remember that a node is missing a record
+        @param clock a function that returns the current time in seconds
+        '''
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = LRUCache(maxsize)
+        self._lock = threading.RLock()
+
+    def is_missing(self, node, key):
+        '''
+        @param key the record that was looked up, like 'addr', or 'resolver' for the resolver
+        @returns True if the record was recently found to be empty
+        '''
+        with self._lock:
+            entry = self._live_entry(node)
+            return entry is not None and key in entry.values
+
+    def put(self, node, key):
+        with self._lock:
+            entry = self._live_entry(node)
+            if entry is None:
+                entry = _Entry(self._clock() + self.ttl)
+                self._entries[node] = entry
+            entry.values[key] = True
+
+    def evict(self, node):
+        self._entries.pop(node)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __contains__(self, node):
+        with self._lock:
+            return self._live_entry(node) is not None
+
+    def _live_entry(self, node):
+        entry = self._entries.get(node)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._entries.pop(node)
+            return None
+        return entry
+
+
+class _Entry:
+    __slots__ = ('expires_at', 'values')
+
+    def __init__(self, expires_at):
+        self.expires_at = expires_at
+        self.values = {}
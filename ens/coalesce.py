@@ -0,0 +1,73 @@
+'''
+Coalesce identical lookups that run at the same time, so that they share one set of requests
+'''
+import asyncio
+import threading
+
+
+class SingleFlight:
+    '''
+    While a call with some key is running, other threads that make a call with the same key
+    wait for it, and get its result or exception, instead of making the call again.
+    '''
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args):
+        '''
+        @param key a hashable that identifies calls with the same result
+        @returns the result of `function(*args)`, which may come from a concurrent call
+        '''
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function(*args)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class AsyncSingleFlight:
+    '''
+    Like :class:`SingleFlight`, for coroutines on one event loop. Cancelling one waiting
+    coroutine does not cancel the shared call.
+    '''
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, coroutine_function, *args):
+        '''
+        @param key a hashable that identifies calls with the same result
+        @returns the result of `await coroutine_function(*args)`, which may be shared
+        '''
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(coroutine_function(*args))
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(call)
@@ -1,6 +1,46 @@
 
 ACCEPTABLE_STALE_HOURS = 48
 
+# when the last seen block is too old, the fewest seconds to wait before asking for the latest again
+FRESHNESS_CHECK_INTERVAL = 15
+
+DEFAULT_TLD = 'eth'
+RECOGNIZED_TLDS = [DEFAULT_TLD, 'reverse', 'test']
+
 EMPTY_SHA3_BYTES = b'\0' * 32
 
 EMPTY_ADDR_HEX = '0x' + '00' * 20
+
+# number of name -> node entries that each ENS instance remembers, including parent names
+NAMEHASH_CACHE_SIZE = 8192
+
+# number of non-ASCII or unnormalized names whose normalized form is remembered, per process
+NAMEPREP_CACHE_SIZE = 8192
+
+# number of ens.utils.Address objects that are reused, per process
+ADDRESS_CACHE_SIZE = 8192
+
+# number of resolver or deed contract objects that are reused, by address
+CONTRACT_CACHE_SIZE = 256
+
+# defaults for ens.cache.ResolutionCache, with lifetimes in seconds
+RESOLUTION_CACHE_SIZE = 4096
+RESOLUTION_MIN_TTL = 60
+RESOLUTION_MAX_TTL = 3600
+
+# defaults for ens.cache.NegativeCache, which remembers names and addresses that resolve to nothing
+NEGATIVE_CACHE_SIZE = 16384
+NEGATIVE_CACHE_TTL = 30
+
+# the most blocks of logs that ens.invalidator.CacheInvalidator reads at once, before it gives up
+# and clears the whole cache instead
+INVALIDATION_MAX_BLOCKS = 1000
+
+# number of connections that each pooled provider in ens.providers opens, at most
+PROVIDER_POOL_SIZE = 8
+
+# the ABI encodings that ENS.records() accepts from resolvers: JSON, zlib JSON, CBOR and URI
+ABI_CONTENT_TYPES = 1 | 2 | 4 | 8
+
+# upper bounds of the latency histograms of ens.instrument.Stats, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
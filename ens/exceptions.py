@@ -0,0 +1,17 @@
+import idna
+
+
+class AddressMismatch(ValueError):
+    pass
+
+
+class InvalidName(idna.IDNAError):
+    pass
+
+
+class UnauthorizedError(Exception):
+    pass
+
+
+class UnownedName(Exception):
+    pass
@@ -0,0 +1,42 @@
+'''
+Read the hottest contract functions with a raw eth_call, skipping the ABI lookup, type checks and
+encoding that web3 contract functions redo on every call
+'''
+import functools
+
+from ens.batch import decode_address, node_call
+
+# functions that take only a node and return an address
+FAST_FUNCTIONS = ('addr', 'owner', 'resolver')
+
+# '0x' and one 32-byte word
+ADDRESS_RESULT_LENGTH = 2 + 64
+
+
+class FastContract:
+    '''
+    Wraps a :class:`~web3.contract.ConciseContract`. Calls to one of `fast_functions` with just
+    a node are sent as a raw eth_call, with precomputed calldata, and the address is decoded
+    directly. Other calls, and results that don't hold exactly one word, go through the
+    wrapped contract.
+    '''
+
+    def __init__(self, contract, web3, fast_functions=FAST_FUNCTIONS):
+        self._contract = contract
+        self._web3 = web3
+        self._fast_functions = fast_functions
+        address = getattr(getattr(contract, '_classic_contract', None), 'address', None)
+        self._address = address if isinstance(address, str) else None
+
+    def __getattr__(self, attr):
+        if attr in self._fast_functions and self._address is not None:
+            return functools.partial(self._call, attr)
+        return getattr(self._contract, attr)
+
+    def _call(self, function, node, *args, **kwargs):
+        if args or kwargs or not isinstance(node, bytes) or len(node) != 32:
+            return getattr(self._contract, function)(node, *args, **kwargs)
+        result = self._web3.manager.request_blocking(*node_call(self._address, function, node))
+        if not isinstance(result, str) or len(result) != ADDRESS_RESULT_LENGTH:
+            return getattr(self._contract, function)(node)
+        return decode_address(result)
@@ -0,0 +1,264 @@
+'''
+Observe the public operations of ENS and Registrar, with the JSON-RPC requests and cache lookups
+made for each one
+
+Observers are only called while an operation of an ENS with observers is running, so an ENS
+without any costs one attribute check per operation.
+'''
+from bisect import bisect_left
+from collections import defaultdict
+import functools
+import json
+import threading
+import time
+
+from ens.constants import LATENCY_BUCKETS
+
+_local = threading.local()
+
+
+class Observer:
+    '''
+    Base class of the observers in :attr:`ENS.observers <ens.main.ENS>`. Override any of these
+    methods. They are called in the thread that runs the operation, and nested public calls,
+    like :meth:`~ens.main.ENS.address` inside :meth:`~ens.main.ENS.setup_name`, are reported
+    as operations too.
+    '''
+
+    # encoding each request and response to count its bytes costs as much as the rest of the
+    # instrumentation, so the sizes passed to rpc() are 0 unless an observer sets this
+    counts_bytes = False
+
+    def operation_started(self, name, args=(), kwargs=None):
+        '@param args and kwargs the arguments of the call, without self'
+        pass
+
+    def operation_finished(self, name, seconds, error):
+        '@param error the exception that the operation raised, or None'
+        pass
+
+    def rpc(self, method, seconds, request_size, response_size, batched=(), params=None):
+        '''
+        @param request_size the length of the JSON encoding of the params, or of the whole batch,
+            if any observer :attr:`counts_bytes`
+        @param batched for a method of 'batch', the method of each request in the batch
+        @param params the params of the request, or the (method, params) of each one in a batch
+        '''
+        pass
+
+    def cache(self, cache, hit):
+        '@param cache the name of the cache: \'resolution\' or \'negative\''
+        pass
+
+
+def observed(method):
+    '''
+    Report each call of a public method of ENS or Registrar as an operation, to the observers
+    of the instance, or of the operation that called it
+    '''
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def observed_method(self, *args, **kwargs):
+        outer = active_observers()
+        # observers added or removed meanwhile only see the operations that start after
+        observers = tuple(outer or self.observers)
+        if not observers:
+            return method(self, *args, **kwargs)
+        _local.observers = observers
+        for observer in observers:
+            observer.operation_started(name, args, kwargs)
+        error = None
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            for observer in reversed(observers):
+                observer.operation_finished(name, seconds, error)
+            _local.observers = outer
+    return observed_method
+
+
+def active_observers():
+    '@returns the observers of the operation running in this thread, if any'
+    return getattr(_local, 'observers', ())
+
+
+def record_rpc(method, seconds, request, response, batched=()):
+    '''
+    Report a JSON-RPC request to the observers of the running operation, if any
+
+    @param request the params of the request, or the whole batch
+    @param response the response, or the list of responses to a batch
+    '''
+    observers = active_observers()
+    if observers:
+        if any(observer.counts_bytes for observer in observers):
+            request_size, response_size = _json_size(request), _json_size(response)
+        else:
+            request_size = response_size = 0
+        for observer in observers:
+            observer.rpc(method, seconds, request_size, response_size, batched, request)
+
+
+def record_cache(cache, hit):
+    for observer in active_observers():
+        observer.cache(cache, hit)
+
+
+def make_instrument_middleware():
+    '@returns a middleware that reports each request to the observers of the running operation'
+    def instrument_middleware(make_request, web3):
+        def middleware(method, params):
+            if not active_observers():
+                return make_request(method, params)
+            response = None
+            start = time.perf_counter()
+            try:
+                response = make_request(method, params)
+                return response
+            finally:
+                record_rpc(method, time.perf_counter() - start, params, response)
+        return middleware
+    return instrument_middleware
+
+
+def _json_size(value):
+    if value is None:
+        return 0
+    return len(json.dumps(value, default=str))
+
+
+class Histogram:
+    '''
+    Counts of observed values, like latencies in seconds, by the first bucket bound that is at
+    least as large
+    '''
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        buckets = ['%g' % bound for bound in self.bounds] + ['+Inf']
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': dict(zip(buckets, self.counts)),
+        }
+
+
+class Stats(Observer):
+    '''
+    Aggregate the RPC requests, bytes, latencies and cache lookups of each top-level operation.
+    Requests made by nested public calls count toward the operation that made them. It is safe
+    to share between threads.
+
+    Export it with :meth:`as_dict`, which has an entry for each operation, like 'ENS.address':
+    {'calls', 'errors', 'latency', 'rpc': {method: stats}, 'cache': {cache: {'hits', 'misses'}}}
+    '''
+
+    def __init__(self, count_bytes=False):
+        '''
+        @param count_bytes if True, also count the bytes of each request and response, which
+            costs a JSON encoding of each one
+        '''
+        self.counts_bytes = count_bytes
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._operations = defaultdict(_OperationStats)
+
+    def operation_started(self, name, args=(), kwargs=None):
+        if getattr(self._local, 'depth', 0) == 0:
+            self._local.operation = name
+            self._local.depth = 0
+        self._local.depth += 1
+
+    def operation_finished(self, name, seconds, error):
+        depth = getattr(self._local, 'depth', 0)
+        if not depth:
+            # added while the operation was running
+            return
+        self._local.depth = depth - 1
+        if self._local.depth == 0:
+            with self._lock:
+                stats = self._operations[self._local.operation]
+                stats.calls += 1
+                stats.errors += error is not None
+                stats.latency.observe(seconds)
+
+    def rpc(self, method, seconds, request_size, response_size, batched=(), params=None):
+        if not getattr(self._local, 'depth', 0):
+            return
+        with self._lock:
+            stats = self._operations[self._local.operation]
+            rpc = stats.rpc[method]
+            rpc.requests += 1
+            rpc.request_bytes += request_size
+            rpc.response_bytes += response_size
+            rpc.latency.observe(seconds)
+            for batched_method in batched:
+                stats.rpc[batched_method].batched += 1
+
+    def cache(self, cache, hit):
+        if not getattr(self._local, 'depth', 0):
+            return
+        with self._lock:
+            lookups = self._operations[self._local.operation].cache[cache]
+            lookups['hits' if hit else 'misses'] += 1
+
+    def as_dict(self):
+        '@returns the stats so far, as plain dicts, lists and numbers'
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._operations.items()}
+
+    def clear(self):
+        with self._lock:
+            self._operations.clear()
+
+
+class _OperationStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+        self.rpc = defaultdict(_RPCStats)
+        self.cache = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'latency': self.latency.as_dict(),
+            'rpc': {method: rpc.as_dict() for method, rpc in self.rpc.items()},
+            'cache': {cache: dict(lookups) for cache, lookups in self.cache.items()},
+        }
+
+
+class _RPCStats:
+    def __init__(self):
+        self.requests = 0
+        self.batched = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'batched': self.batched,
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+            'latency': self.latency.as_dict(),
+        }
@@ -0,0 +1,97 @@
+'''
+Evict cached records as soon as they change on chain, by following the logs of the registry and
+of resolvers
+'''
+from web3 import Web3
+
+from ens.abis import tables
+from ens.constants import INVALIDATION_MAX_BLOCKS
+from ens.utils import keccak
+
+
+def _event_topics(contract, names):
+    'look up topics in the precomputed tables, to avoid loading the ABI'
+    return {
+        topic: event.split('(')[0]
+        for event, topic in tables.TOPICS[contract].items()
+        if event.split('(')[0] in names
+    }
+
+
+REGISTRY_TOPICS = _event_topics('ENS', ('NewOwner', 'NewResolver', 'Transfer', 'NewTTL'))
+
+RESOLVER_TOPICS = _event_topics('RESOLVER', (
+    'AddrChanged',
+    'NameChanged',
+    'ContentChanged',
+    'ABIChanged',
+    'PubkeyChanged',
+))
+
+
+def changed_node(log):
+    '''
+    @param log a log of one of the registry or resolver events
+    @returns the node whose records may have changed, as bytes
+    '''
+    topics = [_to_bytes(topic) for topic in log['topics']]
+    if REGISTRY_TOPICS.get(Web3.toHex(topics[0])) == 'NewOwner':
+        # NewOwner(node, label, owner) sets the owner of the subnode, not of `node`
+        return keccak(topics[1] + topics[2])
+    return topics[1]
+
+
+def _to_bytes(topic):
+    return Web3.toBytes(hexstr=topic) if isinstance(topic, str) else bytes(topic)
+
+
+class CacheInvalidator:
+    '''
+    Follows new blocks, and evicts the nodes from the caches of an ENS instance whose owner,
+    resolver, TTL or records change. Cached entries can then live much longer, because changes
+    are seen within one block.
+
+    Every resolver is watched, not just the public resolver, because any contract can be set as
+    the resolver of a name.
+
+    Call :meth:`poll` regularly, for example once per block or before each batch of lookups.
+    '''
+
+    def __init__(self, ens, from_block=None):
+        '''
+        @param ens the ENS instance whose cache should be kept up to date
+        @param from_block the first block to read logs from, defaults to the next block
+        '''
+        self.ens = ens
+        if from_block is None:
+            from_block = ens.web3.eth.blockNumber + 1
+        self.next_block = from_block
+
+    def poll(self):
+        '''
+        Read the logs of all blocks since the last poll, and evict the nodes that changed.
+        If too many blocks passed, clear the whole cache instead.
+
+        @returns the list of evicted nodes, or None if the cache was cleared
+        '''
+        head = self.ens.web3.eth.blockNumber
+        if head < self.next_block:
+            return []
+        from_block, self.next_block = self.next_block, head + 1
+        if head - from_block >= INVALIDATION_MAX_BLOCKS:
+            self.ens._forget_all()
+            return None
+        nodes = []
+        for log in self._logs(from_block, head):
+            node = changed_node(log)
+            self.ens._forget(node)
+            nodes.append(node)
+        return nodes
+
+    def _logs(self, from_block, to_block):
+        blocks = {'fromBlock': hex(from_block), 'toBlock': hex(to_block)}
+        registry_filter = dict(blocks, address=self.ens._ens_addr, topics=[list(REGISTRY_TOPICS)])
+        resolver_filter = dict(blocks, topics=[list(RESOLVER_TOPICS)])
+        for log_filter in (registry_filter, resolver_filter):
+            for log in self.ens.web3.manager.request_blocking('eth_getLogs', [log_filter]):
+                yield log
@@ -1,15 +1,53 @@
 
-import idna
+from collections import namedtuple
+from contextlib import contextmanager
 
 from web3 import Web3
 
 from ens import abis
-from ens.constants import EMPTY_SHA3_BYTES
+from ens.batch import (
+    NODE_DECODERS,
+    batch_node_calls,
+    can_batch,
+    decode_address,
+    decode_string,
+    decode_uint,
+)
+from ens.cache import NegativeCache, ResolutionCache
+from ens.coalesce import SingleFlight
+from ens.constants import (  # noqa: F401
+    ABI_CONTENT_TYPES,
+    CONTRACT_CACHE_SIZE,
+    DEFAULT_TLD,
+    NAMEHASH_CACHE_SIZE,
+    RECOGNIZED_TLDS,
+)
+from ens.exceptions import (  # noqa: F401
+    AddressMismatch,
+    InvalidName,
+    UnauthorizedError,
+    UnownedName,
+)
+from ens.fastpath import FastContract
+from ens.instrument import Stats, make_instrument_middleware, observed, record_cache
+from ens.middleware import BlockPins, FreshnessMonitor, make_block_pin_middleware, pinnable
+from ens.records import RECORD_FIELDS, Records, record_calls, validate_fields
 from ens.registrar import Registrar
-from ens.utils import dict_copy, ensure_hex, init_web3
-
-DEFAULT_TLD = 'eth'
-RECOGNIZED_TLDS = [DEFAULT_TLD, 'reverse', 'test']
+from ens.trace import Trace
+from ens.utils import (
+    LRUCache,
+    Name,
+    checksum_if_address,
+    dict_copy,
+    full_name,
+    init_web3,
+    label_to_hash,
+    labels_to_chain,
+    labels_to_node,
+    namehash_many,
+    nameprep,
+    to_address,
+)
 
 ENS_MAINNET_ADDR = '0x314159265dd8dbb310642f98f50c066173c1259b'
 
@@ -22,39 +60,174 @@ GAS_DEFAULT = {
     }
 
 
+Ownership = namedtuple('Ownership', 'name, node, owner, resolver, ttl')
+
+
 class ENS:
     '''
     Unless otherwise specified, all addresses are assumed to be a str in hex format, like:
     "0x314159265dd8dbb310642f98f50c066173c1259b"
+
+    An instance can be shared between threads for lookups. See :mod:`ens.providers` for
+    providers that send the requests of many threads in parallel.
     '''
 
-    def __init__(self, providers=None, addr=None):
+    def __init__(
+            self,
+            providers=None,
+            addr=None,
+            cache=None,
+            negative_cache=None,
+            stats=None,
+            trace=False):
         '''
         @param providers is a provider or list of providers for web3
         @param addr is the address of the ENS registry on-chain. If not provided,
             ENS.py will default to the mainnet ENS registry address.
+        @param cache is an optional :class:`~ens.cache.ResolutionCache`, to remember resolvers
+            and records for as long as the registry TTL of each name allows. Pass True to use
+            a cache with the default settings.
+        @param negative_cache is an optional :class:`~ens.cache.NegativeCache`, to briefly
+            remember lookups that found nothing. Pass True to use the default settings.
+        @param stats is an optional :class:`~ens.instrument.Stats`, to count the requests and
+            latency of each operation. Pass True to use a new one.
+        @param trace if True, record a :class:`~ens.trace.Trace` of all operations in
+            `self.tracer`. To trace just a few operations, use :meth:`trace` instead.
         '''
-        self.web3 = init_web3(providers)
+        self.freshness = FreshnessMonitor()
+        self.web3 = init_web3(providers, self.freshness)
+        self._pins = BlockPins()
+        self._flights = SingleFlight()
+        # inside block_pin, so that reads answered from a pinned block are not counted
+        self.web3.middleware_stack.add(make_instrument_middleware(), name='instrument')
+        self.web3.middleware_stack.add(make_block_pin_middleware(self._pins), name='block_pin')
 
         ens_addr = addr if addr else ENS_MAINNET_ADDR
-        self.ens = self.web3.eth.contract(abi=abis.ENS, address=ens_addr)
+        self.ens = FastContract(self.web3.eth.contract(abi=abis.ENS, address=ens_addr), self.web3)
+        self._ens_addr = ens_addr
         self._resolverContract = self.web3.eth.contract(abi=abis.RESOLVER)
         self.registrar = Registrar(self)
-
+        self._nodes = LRUCache(NAMEHASH_CACHE_SIZE)
+        self._resolvers = LRUCache(CONTRACT_CACHE_SIZE)
+        self.cache = ResolutionCache() if cache is True else cache
+        self.negative_cache = NegativeCache() if negative_cache is True else negative_cache
+        self.stats = Stats() if stats is True else stats
+        self.tracer = Trace() if trace else None
+        # instances of ens.instrument.Observer, which may be added to
+        self.observers = [
+            observer for observer in (self.stats, self.tracer) if observer is not None
+        ]
+
+    @observed
+    @pinnable
     def address(self, name):
         return self.resolve(name, 'addr')
 
+    @observed
+    @pinnable
+    def address_many(self, names):
+        '''
+        Look up the address of each name, like :meth:`address`, using two batched round trips:
+        one for the resolvers of all the names, and one for all of their addresses.
+
+        @returns a list of addresses, in the same order as `names`, with None for each name
+            that has no resolver or no address
+        '''
+        nodes = list(self.namehash_many(names))
+        resolvers = self._batch_addresses((self._ens_addr, 'resolver', node) for node in nodes)
+        addresses = iter(self._batch_addresses(
+            (resolver, 'addr', node) for resolver, node in zip(resolvers, nodes) if resolver
+        ))
+        return [next(addresses) if resolver else None for resolver in resolvers]
+
+    @observed
+    @pinnable
+    def records(self, name, fields=RECORD_FIELDS, abi_content_types=ABI_CONTENT_TYPES):
+        '''
+        Read several records of one name, using two round trips: one for the resolver, and one
+        batch for all of the records.
+
+        @param fields the records to read, any of: 'addr', 'name', 'content', 'ABI', 'pubkey'
+        @param abi_content_types the bitmask of ABI encodings to accept, like in EIP 205
+        @returns a :class:`~ens.records.Records`
+        '''
+        return self.records_many([name], fields, abi_content_types)[0]
+
+    @observed
+    @pinnable
+    def records_many(self, names, fields=RECORD_FIELDS, abi_content_types=ABI_CONTENT_TYPES):
+        '''
+        Read several records of many names, like :meth:`records`, using two batched round trips:
+        one for the resolvers of all the names, and one for all of their records.
+
+        @returns a list of :class:`~ens.records.Records`, in the same order as `names`
+        '''
+        fields = validate_fields(fields)
+        nodes = list(self.namehash_many(names))
+        resolvers = self._batch_addresses((self._ens_addr, 'resolver', node) for node in nodes)
+        calls = []
+        for resolver, node in zip(resolvers, nodes):
+            if resolver:
+                calls.extend(record_calls(resolver, node, fields, abi_content_types))
+        results = iter(batch_node_calls(
+            self.web3,
+            calls,
+            self._pins.block_identifier(),
+            self.freshness,
+        ))
+        return [
+            Records(resolver, **{field: NODE_DECODERS[field](next(results)) for field in fields})
+            if resolver else Records()
+            for resolver in resolvers
+        ]
+
+    @observed
+    @pinnable
     def name(self, address):
         reversed_domain = self.reverse_domain(address)
         return self.resolve(reversed_domain, get='name')
     reverse = name
 
+    @observed
+    @pinnable
+    def name_many(self, addresses, verify=True):
+        '''
+        Look up the name of each address, like :meth:`name`, in a fixed number of batched
+        round trips: two for the reverse records, and two more to verify them.
+
+        @param verify if True, only return a name if it resolves back to the same address.
+            Anyone can claim any name in the reverse record of their own address.
+        @returns a list of names, in the same order as `addresses`, with None for each address
+            that has no name (or no verified name)
+        '''
+        addresses = [to_address(address) for address in addresses]
+        reverse_nodes = list(self.namehash_many(map(self.reverse_domain, addresses)))
+        resolvers = self._batch_addresses(
+            (self._ens_addr, 'resolver', node) for node in reverse_nodes
+        )
+        results = iter(batch_node_calls(self.web3, (
+            (resolver, 'name', node) for resolver, node in zip(resolvers, reverse_nodes) if resolver
+        ), self._pins.block_identifier(), self.freshness))
+        names = [decode_string(next(results)) if resolver else None for resolver in resolvers]
+        if not verify:
+            return names
+        claims = [(idx, name) for idx, name in enumerate(names) if self._is_valid_name(name)]
+        forward_addresses = self.address_many(name for _, name in claims)
+        verified = [None] * len(names)
+        for (idx, name), forward in zip(claims, forward_addresses):
+            if forward and to_address(forward) == addresses[idx]:
+                verified[idx] = name
+        return verified
+
+    @observed
     @dict_copy
     def setup_address(self, name, address=None, transact={}):
         (owner, unowned, owned) = self._first_owner(name)
         if not address:
             address = owner
-        if self.address(name) == ensure_hex(address):
+        address = to_address(address)
+        current_address = self.address(name)
+        if current_address and to_address(current_address) == address:
             return None
         self._assert_control(owner, name, owned)
         if unowned:
@@ -62,12 +235,11 @@ class ENS:
         transact['from'] = owner
         resolver = self._set_resolver(name, transact=transact)
         transact['gas'] = GAS_DEFAULT['setAddr']
-        if isinstance(address, str):
-            address = Web3.toBytes(hexstr=address)
-        else:
-            address = Web3.toBytes(address)
-        return resolver.setAddr(self.namehash(name), address, transact=transact)
+        node = self.namehash(name)
+        self._forget(node)
+        return resolver.setAddr(node, address.raw, transact=transact)
 
+    @observed
     @dict_copy
     def setup_name(self, name, address=None, transact={}):
         resolved = self.address(name)
@@ -85,100 +257,171 @@ class ENS:
             self.setup_address(name, address, transact=transact)
         return self._setup_reverse(name, address, transact=transact)
 
+    @observed
+    @pinnable
     def resolve(self, name, get='addr'):
-        resolver = self.resolver(name)
-        if resolver:
-            lookup_function = getattr(resolver, get)
-            resolved = lookup_function(self.namehash(name))
-            if self.web3.isAddress(resolved):
-                resolved = self.web3.toChecksumAddress(resolved)
-            return resolved
-        else:
+        node = self.namehash(name)
+        cache = self._live_cache()
+        if cache is not None:
+            resolved = cache.get(node, get)
+            record_cache('resolution', resolved is not None)
+            if resolved is not None:
+                return resolved
+        if self._is_missing(node, get):
             return None
+        flight_key = self._flight_key('resolve', node, get)
+        return self._flights.do(flight_key, self._lookup, name, node, get)
 
     def namehash(self, name):
-        name = self._full_name(name)
-        node = EMPTY_SHA3_BYTES
-        if name:
-            labels = name.split(".")
-            for label in reversed(labels):
-                labelhash = self.labelhash(label)
-                assert isinstance(labelhash, bytes)
-                assert isinstance(node, bytes)
-                sha_hex = Web3.sha3(node + labelhash)
-                node = Web3.toBytes(hexstr=sha_hex)
-        return node
+        if isinstance(name, Name):
+            return name.node
+        labels = self._full_name(name).split('.')
+        return labels_to_node(labels, self._nodes, self.labelhash)
 
+    def namehash_chain(self, name):
+        '''
+        @returns a list of the namehash of `name` and of each of its parents, hashed in one pass.
+            For example, the nodes of: ['a.foo.eth', 'foo.eth', 'eth']
+        '''
+        if isinstance(name, Name):
+            labelhashes = dict(zip(name.labels, name.labelhashes))
+            return labels_to_chain(name.labels, self._nodes, labelhashes.__getitem__)
+        labels = self._full_name(name).split('.')
+        return labels_to_chain(labels, self._nodes, self.labelhash)
+
+    def namehash_many(self, names):
+        '''
+        Generate the namehash of each name in `names`, in order, like :meth:`namehash`.
+        Use this instead of calling :meth:`namehash` in a loop, when hashing many names.
+        '''
+        return namehash_many(names)
+
+    @observed
+    @pinnable
     def resolver(self, name):
-        resolver_addr = self.ens.resolver(self.namehash(name))
+        node = self.namehash(name)
+        cache = self._live_cache()
+        resolver_addr = None
+        if cache is not None:
+            resolver_addr = cache.get(node, 'resolver')
+            record_cache('resolution', resolver_addr is not None)
+        if resolver_addr is None:
+            if self._is_missing(node, 'resolver'):
+                return None
+            flight_key = self._flight_key('resolver', node)
+            resolver_addr = self._flights.do(flight_key, self._lookup_resolver, node)
         if not resolver_addr:
             return None
-        return self._resolverContract(address=resolver_addr)
+        return self._resolver_at(resolver_addr)
 
+    @observed
+    @pinnable
     def reverser(self, target_address):
         reversed_domain = self.reverse_domain(target_address)
         return self.resolver(reversed_domain)
 
+    @observed
+    @pinnable
+    def ownership_chain(self, name):
+        '''
+        Look up the owner, resolver and TTL of `name` and of each of its parents, in one
+        batched round trip.
+
+        @returns a list of :class:`Ownership`, from `name` up to its top-level domain. Each owner
+            and resolver is None if it is not set.
+        '''
+        labels = self._full_name(name).split('.')
+        nodes = self.namehash_chain(name)
+        calls = [
+            (self._ens_addr, function, node)
+            for node in nodes
+            for function in ('owner', 'resolver', 'ttl')
+        ]
+        results = iter(batch_node_calls(
+            self.web3,
+            calls,
+            self._pins.block_identifier(),
+            self.freshness,
+        ))
+        return [
+            Ownership(
+                '.'.join(labels[idx:]),
+                node,
+                decode_address(next(results)),
+                decode_address(next(results)),
+                decode_uint(next(results)),
+            )
+            for idx, node in enumerate(nodes)
+        ]
+
+    @observed
+    @pinnable
     def owner(self, name):
         node = self.namehash(name)
-        return self.ens.owner(node)
+        return self._flights.do(self._flight_key('owner', node), self.ens.owner, node)
 
     def labelhash(self, label):
-        prepped = self.nameprep(label)
-        label_bytes = prepped.encode()
-        sha_hex = Web3.sha3(label_bytes)
-        return Web3.toBytes(hexstr=sha_hex)
+        return label_to_hash(self.nameprep(label))
 
     def reverse_domain(self, address):
-        address = ensure_hex(address)
-        if address.startswith('0x'):
-            address = address[2:]
-        address = address.lower()
-        return address + '.' + REVERSE_REGISTRAR_DOMAIN
+        return to_address(address).hex[2:] + '.' + REVERSE_REGISTRAR_DOMAIN
 
     @staticmethod
     def nameprep(name):
+        return nameprep(name)
+
+    def _is_valid_name(self, name):
         if not name:
-            return name
+            return False
         try:
-            return idna.decode(name, uts46=True, std3_rules=True)
-        except idna.IDNAError as exc:
-            raise InvalidName("%s is an invalid name, because %s" % (name, exc)) from exc
+            self.nameprep(name)
+        except InvalidName:
+            return False
+        return True
+
+    def _batch_addresses(self, calls):
+        results = batch_node_calls(self.web3, calls, self._pins.block_identifier(), self.freshness)
+        return [decode_address(result) for result in results]
 
     def _reverse_node(self, address):
         domain = self.reverse_domain(address)
         return self.namehash(domain)
 
     def _assert_control(self, account, name, parent_owned=None):
-        if account not in self.web3.eth.accounts:
+        accounts = {to_address(controlled) for controlled in self.web3.eth.accounts}
+        if not account or to_address(account) not in accounts:
             raise UnauthorizedError(
                     "in order to modify %r, you must control account %r, which owns %r" % (
                         name, account, parent_owned or name))
 
     def _first_owner(self, name):
         '@returns (owner or None, list(unowned_subdomain_labels), first_owned_domain)'
-        owner = None
+        labels = self._full_name(name).split('.')
+        nodes = self.namehash_chain(name)
+        if can_batch(self.web3):
+            owners = self._batch_addresses((self._ens_addr, 'owner', node) for node in nodes)
+        else:
+            # one request per level, so stop at the first owned name
+            owners = (self.ens.owner(node) for node in nodes)
         unowned = []
-        pieces = self._full_name(name).split('.')
-        while not owner and pieces:
-            name = '.'.join(pieces)
-            owner = self.owner(name)
-            if not owner:
-                unowned.append(pieces.pop(0))
-        return (owner, unowned, name)
+        for idx, owner in enumerate(owners):
+            if owner:
+                return (owner, unowned, '.'.join(labels[idx:]))
+            unowned.append(labels[idx])
+        return (None, unowned, labels[-1])
 
     @dict_copy
     def _claim_ownership(self, owner, unowned, owned, transact={}):
         transact['from'] = owner
         transact['gas'] = GAS_DEFAULT['setSubnodeOwner']
-        for label in reversed(unowned):
+        nodes = self.namehash_chain('.'.join(unowned + [owned]))
+        for idx in reversed(range(len(unowned))):
             self.ens.setSubnodeOwner(
-                    self.namehash(owned),
-                    self.labelhash(label),
+                    nodes[idx + 1],
+                    self.labelhash(unowned[idx]),
                     owner,
                     transact=transact
                     )
-            owned = "%s.%s" % (label, owned)
 
     @dict_copy
     def _set_resolver(self, name, resolver_addr=None, transact={}):
@@ -186,46 +429,127 @@ class ENS:
             resolver_addr = self.address('resolver.eth')
         namehash = self.namehash(name)
         if self.ens.resolver(namehash) != resolver_addr:
+            self._forget(namehash)
             transact['gas'] = GAS_DEFAULT['setResolver']
             self.ens.setResolver(
                     namehash,
                     Web3.toBytes(hexstr=resolver_addr),
                     transact=transact
                     )
-        return self._resolverContract(address=resolver_addr)
+        return self._resolver_at(resolver_addr)
+
+    @contextmanager
+    def trace(self):
+        '''
+        Record a :class:`~ens.trace.Trace` of the operations inside the context, with the
+        JSON-RPC requests beneath each one: `with ens.trace() as trace: ...`
+        Operations that other threads run meanwhile are recorded too.
+        '''
+        trace = Trace()
+        # replace the list, so that running operations keep the observers they started with
+        self.observers = self.observers + [trace]
+        try:
+            yield trace
+        finally:
+            self.observers = [observer for observer in self.observers if observer is not trace]
+
+    def at_block(self, block_identifier='latest'):
+        '''
+        Pin all reads to one block, inside the context: `with ens.at_block(4000000): ...`
+        Identical reads inside the context are only requested once.
+
+        Every read method also takes a `block_identifier` keyword argument, to pin just that call.
+
+        @param block_identifier a block number, or 'latest' to pin reads to the current block
+        '''
+        if block_identifier == 'latest':
+            block_identifier = self.web3.eth.blockNumber
+        elif block_identifier == 'earliest':
+            block_identifier = 0
+        elif not isinstance(block_identifier, int):
+            raise TypeError("Can only pin reads to a block number, 'latest' or 'earliest'")
+        return self._pins.pinned(block_identifier)
+
+    def _lookup(self, name, node, get):
+        resolver = self.resolver(name)
+        if resolver:
+            lookup_function = getattr(resolver, get)
+            resolved = checksum_if_address(lookup_function(node))
+            if resolved:
+                self._remember(node, get, resolved)
+            else:
+                self._remember_missing(node, get)
+            return resolved
+        else:
+            return None
+
+    def _lookup_resolver(self, node):
+        resolver_addr = self.ens.resolver(node)
+        if resolver_addr:
+            self._remember(node, 'resolver', resolver_addr)
+        else:
+            self._remember_missing(node, 'resolver')
+        return resolver_addr
+
+    def _flight_key(self, *lookup):
+        '''
+        @returns a key that is shared by identical lookups, so that concurrent ones are coalesced.
+            Lookups pinned to different blocks are not identical.
+        '''
+        return lookup + (self._pins.block_identifier(), )
+
+    def _live_cache(self):
+        '''
+        @returns the resolution cache, unless reads are pinned to a block. The cache holds
+            recent records, which may not match the records at the pinned block.
+        '''
+        return None if self._pins.current else self.cache
+
+    def _remember(self, node, key, value):
+        if self._live_cache() is not None and value is not None:
+            ttl = self.ens.ttl(node) if self.cache.needs_ttl(node) else 0
+            self.cache.put(node, key, value, ttl)
+
+    def _is_missing(self, node, key):
+        negative_cache = self.negative_cache
+        if negative_cache is None or self._pins.current:
+            return False
+        missing = negative_cache.is_missing(node, key)
+        record_cache('negative', missing)
+        return missing
+
+    def _remember_missing(self, node, key):
+        if self.negative_cache is not None and not self._pins.current:
+            self.negative_cache.put(node, key)
+
+    def _forget(self, node):
+        for cache in (self.cache, self.negative_cache):
+            if cache is not None:
+                cache.evict(node)
+
+    def _forget_all(self):
+        for cache in (self.cache, self.negative_cache):
+            if cache is not None:
+                cache.clear()
+
+    def _resolver_at(self, address):
+        resolver = self._resolvers.get(address)
+        if resolver is None:
+            resolver = FastContract(self._resolverContract(address=address), self.web3)
+            self._resolvers[address] = resolver
+        return resolver
 
     @dict_copy
     def _setup_reverse(self, name, address, transact={}):
         name = self._full_name(name)
         transact['from'] = address
+        self._forget(self._reverse_node(address))
         return self._reverse_registrar().setName(name, transact=transact)
 
     def _reverse_registrar(self):
         addr = self.ens.owner(self.namehash(REVERSE_REGISTRAR_DOMAIN))
         return self.web3.eth.contract(address=addr, abi=abis.REVERSE_REGISTRAR)
 
-    @classmethod
-    def _full_name(cls, name):
-        if isinstance(name, (bytes, bytearray)):
-            name = Web3.toText(name)
-        name = cls.nameprep(name)
-        pieces = name.split('.')
-        if pieces[-1] not in RECOGNIZED_TLDS:
-            pieces.append(DEFAULT_TLD)
-        return '.'.join(pieces)
-
-
-class AddressMismatch(ValueError):
-    pass
-
-
-class InvalidName(idna.IDNAError):
-    pass
-
-
-class UnauthorizedError(Exception):
-    pass
-
-
-class UnownedName(Exception):
-    pass
+    @staticmethod
+    def _full_name(name):
+        return full_name(name)
@@ -0,0 +1,186 @@
+from contextlib import contextmanager
+import functools
+import json
+import threading
+import time
+
+from web3.exceptions import StaleBlockchain
+from web3.middleware import stalecheck
+from web3.utils.datastructures import AttributeDict
+
+from ens.constants import ACCEPTABLE_STALE_HOURS, FRESHNESS_CHECK_INTERVAL
+
+# the JSON-RPC methods that read state at a block, with the index of their block parameter
+PINNABLE_METHODS = {
+    'eth_call': 1,
+    'eth_getBalance': 1,
+    'eth_getCode': 1,
+    'eth_getStorageAt': 2,
+}
+
+
+class BlockPins(threading.local):
+    '''
+    The blocks that reads are pinned to in the current thread, innermost last
+    '''
+
+    def __init__(self):
+        self.stack = []
+
+    @property
+    def current(self):
+        return self.stack[-1] if self.stack else None
+
+    def block_identifier(self):
+        '@returns the pinned block number as a hex quantity, or "latest" if reads are not pinned'
+        return hex(self.current.number) if self.current else 'latest'
+
+    @contextmanager
+    def pinned(self, block_number):
+        if self.current and self.current.number == block_number:
+            yield self.current
+        else:
+            self.stack.append(_Pin(block_number))
+            try:
+                yield self.current
+            finally:
+                self.stack.pop()
+
+
+class _Pin:
+    __slots__ = ('number', 'responses')
+
+    def __init__(self, number):
+        self.number = number
+        self.responses = {}
+
+
+class FreshnessMonitor:
+    '''
+    Remembers the latest block seen, to check that the chain is not stale without asking for the
+    latest block before every request.
+
+    A block that is fresh now was also fresh when it was the latest, so while the last seen block
+    is recent enough, no request is needed. Once it gets too old, the latest block is requested
+    again, at most once every `check_interval` seconds. Until then, requests raise StaleBlockchain.
+
+    Blocks seen elsewhere, like in a JSON-RPC batch, can be passed to :meth:`observe`.
+    '''
+
+    def __init__(
+            self,
+            allowable_delay=ACCEPTABLE_STALE_HOURS * 3600,
+            check_interval=FRESHNESS_CHECK_INTERVAL,
+            clock=time.monotonic):
+        '''
+        @param allowable_delay the oldest, in seconds, that the latest block may be
+        @param check_interval the fewest seconds between requests for the latest block,
+            while the chain is stale
+        @param clock a function that returns the current time in seconds
+        '''
+        if allowable_delay <= 0:
+            raise ValueError("You must set a positive allowable_delay in seconds")
+        self.allowable_delay = allowable_delay
+        self.check_interval = check_interval
+        self.latest = None
+        self._clock = clock
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def due(self):
+        '''
+        @returns True if the caller should request the latest block, and pass it to :meth:`observe`
+        '''
+        with self._lock:
+            if self.latest is not None and stalecheck._isfresh(self.latest, self.allowable_delay):
+                return False
+            now = self._clock()
+            # blocks passed to observe() are not checks, so one may come before any check
+            unchecked = self.latest is None or self._checked_at is None
+            if unchecked or now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                return True
+            return False
+
+    def observe(self, block):
+        '''
+        @param block a block as returned by web3, or as a raw JSON-RPC result
+        '''
+        block = _block_summary(block)
+        with self._lock:
+            if self.latest is None or block.number >= self.latest.number:
+                self.latest = block
+
+    def assert_fresh(self, get_latest_block=None):
+        '''
+        Raise StaleBlockchain unless the latest block seen is recent enough
+
+        @param get_latest_block a function that returns the latest block, called if :meth:`due`
+        '''
+        if get_latest_block is not None and self.due():
+            self.observe(get_latest_block())
+        latest = self.latest
+        if not stalecheck._isfresh(latest, self.allowable_delay):
+            raise StaleBlockchain(latest, self.allowable_delay)
+
+
+def _block_summary(block):
+    number, timestamp = block['number'], block['timestamp']
+    if isinstance(number, str):
+        number, timestamp = int(number, 16), int(timestamp, 16)
+    return AttributeDict({'number': number, 'timestamp': timestamp})
+
+
+def make_stalecheck_middleware(
+        freshness,
+        skip_stalecheck_for_methods=stalecheck.SKIP_STALECHECK_FOR_METHODS):
+    '''
+    Build a middleware that raises StaleBlockchain if the latest block is too old, like the
+    web3 stalecheck middleware, but only asks for the latest block when `freshness` is due.
+
+    @param freshness a :class:`FreshnessMonitor`, which can be shared by many web3 instances
+    '''
+    def stalecheck_middleware(make_request, web3):
+        def middleware(method, params):
+            if method not in skip_stalecheck_for_methods:
+                freshness.assert_fresh(lambda: web3.eth.getBlock('latest'))
+            return make_request(method, params)
+        return middleware
+    return stalecheck_middleware
+
+
+def make_block_pin_middleware(pins):
+    '''
+    Build a middleware that sends each read to the block pinned in `pins`, if any. Identical
+    reads at a pinned block get the same response, without another request.
+    '''
+    def block_pin_middleware(make_request, web3):
+        def middleware(method, params):
+            pin = pins.current
+            if pin is None or method not in PINNABLE_METHODS:
+                return make_request(method, params)
+            block_index = PINNABLE_METHODS[method]
+            params = list(params[:block_index]) + [hex(pin.number)]
+            key = (method, json.dumps(params, sort_keys=True, default=str))
+            if key not in pin.responses:
+                response = make_request(method, params)
+                if 'error' in response:
+                    return response
+                pin.responses[key] = response
+            return pin.responses[key]
+        return middleware
+    return block_pin_middleware
+
+
+def pinnable(method):
+    '''
+    Add a `block_identifier` keyword argument to a read method of ENS or Registrar, to run the
+    method with all of its reads pinned to that block
+    '''
+    @functools.wraps(method)
+    def pinned_method(self, *args, block_identifier=None, **kwargs):
+        if block_identifier is None:
+            return method(self, *args, **kwargs)
+        with self.at_block(block_identifier):
+            return method(self, *args, **kwargs)
+    return pinned_method
@@ -0,0 +1,110 @@
+'''
+Providers that keep a pool of connections, so that threads sharing one ENS instance
+send their requests in parallel, instead of waiting on a single connection
+'''
+from contextlib import contextmanager
+import queue
+import threading
+
+import requests
+from web3 import HTTPProvider, IPCProvider
+from web3.providers.ipc import get_ipc_socket
+
+from ens.batch import decode_batch, encode_batch, receive_json
+from ens.constants import PROVIDER_POOL_SIZE
+
+
+class ConnectionPool:
+    '''
+    Lends each thread its own connection, opening at most `size` of them. When all of them are
+    lent out, threads wait for one to be returned. A connection that raised an error is closed,
+    and replaced by a new one when needed.
+    '''
+
+    def __init__(self, connect, size=PROVIDER_POOL_SIZE):
+        '''
+        @param connect a function that opens a new connection, which must have a close() method
+        '''
+        self._connect = connect
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.size = size
+
+    @contextmanager
+    def connection(self):
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PooledHTTPProvider(HTTPProvider):
+    '''
+    An HTTPProvider with a pool of keep-alive sessions, which also sends JSON-RPC batches.
+    `ENS(PooledHTTPProvider('http://localhost:8545', pool_size=16))`
+    '''
+
+    def __init__(self, endpoint_uri='http://localhost:8545', pool_size=PROVIDER_POOL_SIZE,
+                 request_kwargs=None):
+        super().__init__(endpoint_uri, request_kwargs)
+        self.pool = ConnectionPool(requests.Session, pool_size)
+
+    def make_request(self, method, params):
+        raw_response = self._post(self.encode_rpc_request(method, params))
+        return self.decode_rpc_response(raw_response)
+
+    def make_batch_request(self, requests):
+        '''
+        @param requests a list of (method, params) pairs
+        @returns a list of responses, in the same order as requests
+        '''
+        return decode_batch(self._post(encode_batch(requests)))
+
+    def _post(self, data):
+        kwargs = self.get_request_kwargs()
+        kwargs.setdefault('timeout', 10)
+        with self.pool.connection() as session:
+            response = session.post(self.endpoint_uri, data=data, **kwargs)
+            response.raise_for_status()
+            return response.content
+
+
+class PooledIPCProvider(IPCProvider):
+    '''
+    An IPCProvider with a pool of sockets, which also sends JSON-RPC batches.
+    `ENS(PooledIPCProvider('~/.ethereum/geth.ipc', pool_size=16))`
+    '''
+
+    def __init__(self, ipc_path=None, testnet=False, pool_size=PROVIDER_POOL_SIZE):
+        super().__init__(ipc_path, testnet)
+        self.pool = ConnectionPool(lambda: get_ipc_socket(self.ipc_path), pool_size)
+
+    def make_request(self, method, params):
+        return self._send(self.encode_rpc_request(method, params), self.decode_rpc_response)
+
+    def make_batch_request(self, requests):
+        '''
+        @param requests a list of (method, params) pairs
+        @returns a list of responses, in the same order as requests
+        '''
+        return self._send(encode_batch(requests), decode_batch)
+
+    def _send(self, data, decode):
+        with self.pool.connection() as sock:
+            sock.sendall(data)
+            return decode(receive_json(sock))
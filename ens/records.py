@@ -0,0 +1,55 @@
+from ens.constants import ABI_CONTENT_TYPES
+
+# the records that ENS.records() can read from a resolver, named like the resolver functions
+RECORD_FIELDS = ('addr', 'name', 'content', 'ABI', 'pubkey')
+
+
+class Records:
+    '''
+    The records of one name, read from its resolver. Each record is None if it is empty, or was
+    not requested.
+
+        resolver: the checksummed address of the resolver, or None if the name has none
+        addr: the checksummed address
+        name: the str name, set on reverse records
+        content: the content hash, as 32 bytes
+        ABI: a (content_type, data) pair
+        pubkey: the (x, y) coordinates of the public key, as bytes
+    '''
+    __slots__ = ('resolver', ) + RECORD_FIELDS
+
+    def __init__(self, resolver=None, **records):
+        self.resolver = resolver
+        for field in RECORD_FIELDS:
+            setattr(self, field, records.pop(field, None))
+        if records:
+            raise TypeError("Unknown records: %s" % ', '.join(sorted(records)))
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __eq__(self, other):
+        return isinstance(other, Records) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return 'Records(%s)' % ', '.join(
+            '%s=%r' % (field, getattr(self, field)) for field in self.__slots__
+        )
+
+
+def record_calls(resolver, node, fields, abi_content_types=ABI_CONTENT_TYPES):
+    '@returns the calls that read `fields` of `node` from `resolver`, for batch_node_calls()'
+    return [
+        (resolver, field, node, abi_content_types) if field == 'ABI' else (resolver, field, node)
+        for field in fields
+    ]
+
+
+def validate_fields(fields):
+    fields = tuple(fields)
+    unknown = set(fields) - set(RECORD_FIELDS)
+    if unknown:
+        raise ValueError(
+            "Unknown record fields %r, choose from: %s" % (sorted(unknown), RECORD_FIELDS)
+        )
+    return fields
@@ -7,6 +7,10 @@ import pytz
 from web3 import Web3
 
 from ens import abis
+from ens.constants import CONTRACT_CACHE_SIZE
+from ens.instrument import observed
+from ens.middleware import pinnable
+from ens.utils import LRUCache, Name, keccak
 
 REGISTRAR_NAME = 'eth'
 
@@ -52,21 +56,26 @@ class Registrar:
     def __init__(self, ens):
         self.ens = ens
         self.web3 = ens.web3
-        self._coreContract = self.web3.eth.contract(abi=abis.AUCTION_REGISTRAR)
-        # delay generating this contract so that this class can be created before web3 is online
+        # delay generating these contracts so that this class can be created before web3 is
+        # online, and without loading the ABIs of the auction registrar and deeds
+        self._coreContract = None
         self._core = None
-        self._deedContract = self.web3.eth.contract(abi=abis.DEED)
+        self._deedContract = None
+        self._deeds = LRUCache(CONTRACT_CACHE_SIZE)
         self._short_invalid = True
 
+    @observed
+    @pinnable
     def entries(self, label):
         label = self._to_label(label)
         label_hash = self.ens.labelhash(label)
         return self.entries_by_hash(label_hash)
 
+    @observed
     def start(self, labels, **modifier_dict):
         if not labels:
             return
-        if isinstance(labels, (str, bytes)):
+        if isinstance(labels, (str, bytes, Name)):
             labels = [labels]
         if not modifier_dict:
             modifier_dict = {'transact': {}}
@@ -80,6 +89,7 @@ class Registrar:
         label_hashes = [self.ens.labelhash(label) for label in labels]
         return self.core.startAuctions(label_hashes, **modifier_dict)
 
+    @observed
     def bid(self, label, amount, secret, **modifier_dict):
         """
         @param label to bid on
@@ -105,6 +115,7 @@ class Registrar:
         bid_hash = self._bid_hash(label, sender, amount, secret)
         return self.core.newBid(bid_hash, **modifier_dict)
 
+    @observed
     def reveal(self, label, amount, secret, **modifier_dict):
         if not modifier_dict:
             modifier_dict = {'transact': {}}
@@ -120,6 +131,7 @@ class Registrar:
         return self.core.unsealBid(label_hash, amount, secret_hash, **modifier_dict)
     unseal = reveal
 
+    @observed
     def finalize(self, label, **modifier_dict):
         if not modifier_dict:
             modifier_dict = {'transact': {}}
@@ -129,6 +141,8 @@ class Registrar:
         label_hash = self.ens.labelhash(label)
         return self.core.finalizeAuction(label_hash, **modifier_dict)
 
+    @observed
+    @pinnable
     def entries_by_hash(self, label_hash):
         '''
         @returns a 5-item collection in this order:
@@ -142,18 +156,40 @@ class Registrar:
         entries = self.core.entries(label_hash)
         return AuctionEntries(
             Status(entries[0]),
-            self._deedContract(entries[1]) if entries[1] else None,
+            self._deed_at(entries[1]) if entries[1] else None,
             datetime.fromtimestamp(entries[2], pytz.utc) if entries[2] else None,
             entries[3],
             entries[4],
             )
 
+    def at_block(self, block_identifier='latest'):
+        '''
+        Pin all reads to one block, inside the context, like :meth:`ENS.at_block`
+        '''
+        return self.ens.at_block(block_identifier)
+
+    @property
+    def observers(self):
+        'the observers of the ENS instance, which also see operations of the registrar'
+        return self.ens.observers
+
     @property
     def core(self):
         if not self._core:
+            if self._coreContract is None:
+                self._coreContract = self.web3.eth.contract(abi=abis.AUCTION_REGISTRAR)
             self._core = self._coreContract(address=self.ens.owner(REGISTRAR_NAME))
         return self._core
 
+    def _deed_at(self, address):
+        deed = self._deeds.get(address)
+        if deed is None:
+            if self._deedContract is None:
+                self._deedContract = self.web3.eth.contract(abi=abis.DEED)
+            deed = self._deedContract(address)
+            self._deeds[address] = deed
+        return deed
+
     def __default_gas(self, transact_dict, action):
         if 'gas' not in transact_dict:
             transact_dict['gas'] = GAS_DEFAULT[action]
@@ -184,21 +220,25 @@ class Registrar:
     def _secret_hash(secret):
         if isinstance(secret, str):
             secret = secret.encode()
-        secret_hash = Web3.sha3(secret)
-        return Web3.toBytes(hexstr=secret_hash)
+        elif isinstance(secret, int):
+            # big-endian, like Web3.sha3
+            secret = Web3.toBytes(secret)
+        return keccak(secret)
 
     def _to_label(self, name):
         '''
         Convert from a name, like 'ethfinex.eth', to a label, like 'ethfinex'
         If name is already a label, this should be a noop, except for converting to a string
         '''
-        if isinstance(name, (bytes, bytearray)):
-            name = name.decode()
-        name = self.ens.nameprep(name)
-        if '.' not in name:
-            label = name
+        if isinstance(name, Name):
+            pieces = name.labels
+        else:
+            if isinstance(name, (bytes, bytearray)):
+                name = name.decode()
+            pieces = self.ens.nameprep(name).split('.')
+        if len(pieces) == 1:
+            label = pieces[0]
         else:
-            pieces = name.split('.')
             if len(pieces) != 2:
                 raise ValueError(
                         "You must specify a label, like 'tickets' "
@@ -210,13 +250,13 @@ class Registrar:
             raise InvalidLabel('name %r is too shart' % label)
         return label
 
-    def __entry_lookup(self, label, entry_attr):
-        entries = self.entries(label)
+    def __entry_lookup(self, label, entry_attr, **kwargs):
+        entries = self.entries(label, **kwargs)
         return getattr(entries, entry_attr)
 
     def __getattr__(self, attr):
         if attr in AuctionEntries._fields:
-            return lambda label: self.__entry_lookup(label, attr)
+            return lambda label, **kwargs: self.__entry_lookup(label, attr, **kwargs)
         else:
             raise AttributeError
 
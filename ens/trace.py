@@ -0,0 +1,180 @@
+'''
+Record the tree of calls under each public operation of ENS, down to the JSON-RPC requests, to
+find slow paths and repeated requests
+'''
+from collections import Counter, OrderedDict
+import json
+import reprlib
+import threading
+
+from ens.instrument import Observer
+
+_reprs = reprlib.Repr()
+_reprs.maxstring = 30
+_reprs.maxother = 48
+
+
+class Span:
+    '''
+    One call in a trace: a public operation, a JSON-RPC request or a cache lookup
+
+    @ivar kind 'operation', 'rpc' or 'cache'
+    @ivar label a short description of the call, like "ENS.address('holy.eth')"
+    @ivar key identifies identical calls, which are repeats of each other
+    @ivar seconds how long the call took, None for cache lookups
+    @ivar children the spans of the calls made by this one, in order
+    '''
+
+    __slots__ = ('kind', 'name', 'label', 'key', 'seconds', 'error', 'children')
+
+    def __init__(self, kind, name, label, key=None):
+        self.kind = kind
+        self.name = name
+        self.label = label
+        self.key = key if key is not None else label
+        self.seconds = None
+        self.error = None
+        self.children = []
+
+    def walk(self, stack=()):
+        '@returns each (stack of ancestor spans, span) under this one, depth first'
+        for child in self.children:
+            yield stack, child
+            yield from child.walk(stack + (child, ))
+
+    def self_seconds(self):
+        '@returns the time spent in this span, but not in any of its children'
+        return max(0, (self.seconds or 0) - sum(child.seconds or 0 for child in self.children))
+
+
+class Trace(Observer):
+    '''
+    Record every public operation as a tree of :class:`Span`, from the outermost call down to
+    its JSON-RPC requests. Traces from several threads are kept apart, as separate top-level
+    spans in :attr:`spans`.
+
+    Render it with :meth:`render`, or as a flamegraph with :meth:`folded`. :meth:`repeats` lists
+    identical calls that were made more than once, which are often avoidable.
+    '''
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def operation_started(self, name, args=(), kwargs=None):
+        label = '%s(%s)' % (name, _format_args(args, kwargs))
+        key = '%s %r %r' % (name, args, sorted((kwargs or {}).items()))
+        self._open(Span('operation', name, label, key))
+
+    def operation_finished(self, name, seconds, error):
+        stack = getattr(self._local, 'stack', None)
+        if not stack:
+            # added while the operation was running
+            return
+        span = stack.pop()
+        span.seconds = seconds
+        span.error = error
+
+    def rpc(self, method, seconds, request_size, response_size, batched=(), params=None):
+        if batched:
+            label = '%s[%s]' % (method, ', '.join(batched))
+        elif method == 'eth_call' and params:
+            # the contract and calldata say more than the whole transaction dict
+            call = params[0]
+            label = 'eth_call(%s)' % _format_args([call.get('to'), call.get('data')], None)
+        else:
+            label = '%s(%s)' % (method, _format_args(params or (), None))
+        key = '%s %s' % (method, json.dumps(params, sort_keys=True, default=str))
+        span = Span('rpc', method, label, key)
+        span.seconds = seconds
+        self._add(span)
+
+    def cache(self, cache, hit):
+        self._add(Span('cache', cache, '%s cache %s' % (cache, 'hit' if hit else 'miss')))
+
+    def render(self):
+        '@returns the trace as indented text, one call per line, with timings and repeats'
+        repeats = Counter()
+        lines = []
+        for stack, span in self._walk():
+            repeats[span.key] += 1
+            line = '  ' * len(stack) + span.label
+            if span.seconds is not None:
+                line += '  %.2f ms' % (span.seconds * 1e3)
+            if span.error is not None:
+                line += '  raised %s' % type(span.error).__name__
+            if span.kind != 'cache' and repeats[span.key] > 1:
+                line += '  (repeat #%d)' % repeats[span.key]
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def repeats(self):
+        '''
+        @returns the labels of operations and requests that were made more than once with the
+            same arguments, with their counts, most repeated first
+        '''
+        counts = Counter()
+        labels = {}
+        for _, span in self._walk():
+            if span.kind != 'cache':
+                counts[span.key] += 1
+                labels[span.key] = span.label
+        return [(labels[key], count) for key, count in counts.most_common() if count > 1]
+
+    def folded(self):
+        '''
+        @returns the trace in the folded stack format of flamegraph.pl and speedscope: one line
+            per stack of call names, with the microseconds spent in its last call
+        '''
+        stacks = OrderedDict()
+        for stack, span in self._walk():
+            if span.kind == 'cache':
+                continue
+            folded = ';'.join(frame.name for frame in stack + (span, ))
+            stacks[folded] = stacks.get(folded, 0) + span.self_seconds()
+        return ''.join(
+            '%s %d\n' % (folded, round(seconds * 1e6))
+            for folded, seconds in stacks.items()
+        )
+
+    def write_folded(self, path):
+        with open(path, 'w') as folded:
+            folded.write(self.folded())
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    def _walk(self):
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            yield (), span
+            yield from span.walk((span, ))
+
+    def _open(self, span):
+        self._add(span)
+        self._local.stack.append(span)
+
+    def _add(self, span):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            with self._lock:
+                self.spans.append(span)
+
+
+def _format_args(args, kwargs):
+    formatted = [_format_arg(arg) for arg in args]
+    formatted += ['%s=%s' % (key, _format_arg(value)) for key, value in (kwargs or {}).items()]
+    return ', '.join(formatted)
+
+
+def _format_arg(arg):
+    if isinstance(arg, (bytes, bytearray)):
+        return _reprs.repr('0x' + arg.hex())
+    return _reprs.repr(arg)
@@ -1,9 +1,278 @@
+from collections import OrderedDict
+import re
+import threading
 
+from eth_utils import keccak
+import idna
 from web3 import HTTPProvider, IPCProvider, Web3
 from web3.contract import ConciseContract
-from web3.middleware import make_stalecheck_middleware
 
-from ens.constants import ACCEPTABLE_STALE_HOURS
+from ens.constants import (
+    ADDRESS_CACHE_SIZE,
+    DEFAULT_TLD,
+    EMPTY_SHA3_BYTES,
+    NAMEHASH_CACHE_SIZE,
+    NAMEPREP_CACHE_SIZE,
+    RECOGNIZED_TLDS,
+)
+from ens.exceptions import InvalidName
+from ens.middleware import FreshnessMonitor, make_stalecheck_middleware
+
+# the label separators that IDNA accepts, which all normalize to '.'
+UNICODE_DOTS = re.compile('[\u002e\u3002\uff0e\uff61]')
+
+# Names that nameprep() would return unchanged: lowercase ASCII letters, digits and hyphens, in
+# non-empty labels that don't start or end with a hyphen, or have one in the 3rd and 4th position
+_PREPPED_ASCII_LABEL = '(?!..--)[a-z0-9](?:[a-z0-9-]*[a-z0-9])?'
+PREPPED_ASCII_NAME = re.compile('%s(?:\\.%s)*' % (_PREPPED_ASCII_LABEL, _PREPPED_ASCII_LABEL))
+
+# a lowercase hex address, with the 0x prefix
+HEX_ADDRESS = re.compile('0x[0-9a-f]{40}')
+
+
+class LRUCache:
+    '''
+    A mapping that holds at most `maxsize` items, discarding the least recently used item first.
+    It is safe to share between threads.
+    '''
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class Lazy:
+    '''
+    Stands in for the object returned by `factory()`, which is only called on first use.
+    Attribute reads and writes go to that object. It is safe to share between threads.
+    '''
+
+    def __init__(self, factory):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_target', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        target = self._target
+        if target is None:
+            with self._lock:
+                target = self._target
+                if target is None:
+                    target = self._factory()
+                    object.__setattr__(self, '_target', target)
+        return target
+
+    @property
+    def is_built(self):
+        return self._target is not None
+
+    # so that isinstance() checks see the built object's class
+    @property
+    def __class__(self):
+        return type(self._resolve())
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._resolve(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._resolve(), attr)
+
+    def __dir__(self):
+        return dir(self._resolve())
+
+    def __repr__(self):
+        if self.is_built:
+            return repr(self._target)
+        return '<%s of %r, not built yet>' % (type(self).__name__, self._factory)
+
+
+class Name:
+    '''
+    A normalized, fully-qualified name, like 'foo.eth'. A Name is immutable, and it computes its
+    labels, labelhashes and nodes at most once. Reuse a Name for a name that is looked up often.
+
+    All ENS and Registrar methods that accept a name as a str or bytes also accept a Name.
+    '''
+    __slots__ = ('_name', '_labels', '_labelhashes', '_node', '_parent_node')
+
+    def __init__(self, name):
+        if not isinstance(name, Name):
+            name = full_name(name)
+        object.__setattr__(self, '_name', str(name))
+        for attr in self.__slots__[1:]:
+            object.__setattr__(self, attr, None)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("Name is immutable")
+
+    def __delattr__(self, attr):
+        raise AttributeError("Name is immutable")
+
+    def __reduce__(self):
+        return (Name, (self._name, ))
+
+    def __str__(self):
+        return self._name
+
+    def __repr__(self):
+        return 'Name(%r)' % self._name
+
+    def __eq__(self, other):
+        return isinstance(other, Name) and self._name == other._name
+
+    def __hash__(self):
+        return hash(self._name)
+
+    @property
+    def labels(self):
+        if self._labels is None:
+            object.__setattr__(self, '_labels', tuple(self._name.split('.')))
+        return self._labels
+
+    @property
+    def labelhashes(self):
+        if self._labelhashes is None:
+            labelhashes = tuple(label_to_hash(label) for label in self.labels)
+            object.__setattr__(self, '_labelhashes', labelhashes)
+        return self._labelhashes
+
+    @property
+    def node(self):
+        if self._node is None:
+            object.__setattr__(self, '_node', keccak(self.parent_node + self.labelhashes[0]))
+        return self._node
+
+    @property
+    def parent_node(self):
+        if self._parent_node is None:
+            node = EMPTY_SHA3_BYTES
+            for labelhash in reversed(self.labelhashes[1:]):
+                node = keccak(node + labelhash)
+            object.__setattr__(self, '_parent_node', node)
+        return self._parent_node
+
+
+class Address:
+    '''
+    An Ethereum address, which keeps its 20 raw bytes and lowercase hex, and computes its
+    checksummed hex at most once. An Address is immutable.
+
+    Use :func:`to_address` to get one, so that each distinct address is only built once.
+    '''
+    __slots__ = ('_raw', '_hex', '_checksum')
+
+    def __init__(self, raw):
+        if len(raw) != 20:
+            raise ValueError("An address must be 20 bytes, but got %r" % raw)
+        object.__setattr__(self, '_raw', bytes(raw))
+        object.__setattr__(self, '_hex', '0x' + raw.hex())
+        object.__setattr__(self, '_checksum', None)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("Address is immutable")
+
+    def __delattr__(self, attr):
+        raise AttributeError("Address is immutable")
+
+    def __reduce__(self):
+        return (Address, (self._raw, ))
+
+    def __str__(self):
+        return self.checksum
+
+    def __repr__(self):
+        return 'Address(%r)' % self.checksum
+
+    def __eq__(self, other):
+        return isinstance(other, Address) and self._raw == other._raw
+
+    def __hash__(self):
+        return hash(self._raw)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    @property
+    def hex(self):
+        '@returns the lowercase hex, with a 0x prefix'
+        return self._hex
+
+    @property
+    def checksum(self):
+        if self._checksum is None:
+            object.__setattr__(self, '_checksum', Web3.toChecksumAddress(self._hex))
+        return self._checksum
+
+
+_address_cache = LRUCache(ADDRESS_CACHE_SIZE)
+
+
+def to_address(address):
+    '''
+    @param address an Address, 20 bytes, or hex with or without 0x, in any case
+    @returns the Address, reusing one that was recently built for the same address
+    '''
+    if isinstance(address, Address):
+        return address
+    if isinstance(address, str):
+        key = address.lower()
+        if not key.startswith('0x'):
+            key = '0x' + key
+        if not HEX_ADDRESS.fullmatch(key):
+            raise ValueError("%r is not a hex address" % address)
+    else:
+        key = '0x' + bytes(address).hex()
+    interned = _address_cache.get(key)
+    if interned is None:
+        interned = Address(bytes.fromhex(key[2:]))
+        _address_cache[key] = interned
+    return interned
+
+
+def checksum_if_address(value):
+    '''
+    @returns the checksummed form of `value` if it is a hex address, or else `value` unchanged
+    '''
+    if isinstance(value, str) and HEX_ADDRESS.fullmatch(value.lower()):
+        return to_address(value).checksum
+    return value
+
+
+_nameprep_cache = LRUCache(NAMEPREP_CACHE_SIZE)
 
 
 def dict_copy(func):
@@ -20,18 +289,160 @@ def dict_copy(func):
 
 
 def ensure_hex(data):
+    if isinstance(data, Address):
+        return data.hex
+    if isinstance(data, (bytes, bytearray)) and len(data) == 20:
+        return to_address(data).hex
     if not isinstance(data, str):
         return Web3.toHex(data)
     return data
 
 
-def init_web3(providers=None):
+def nameprep(name):
+    if isinstance(name, Name):
+        return str(name)
+    if not name or PREPPED_ASCII_NAME.fullmatch(name):
+        return name
+    prepped = _nameprep_cache.get(name)
+    if prepped is None:
+        try:
+            prepped = idna.decode(name, uts46=True, std3_rules=True)
+        except idna.IDNAError as exc:
+            raise InvalidName("%s is an invalid name, because %s" % (name, exc)) from exc
+        _nameprep_cache[name] = prepped
+    return prepped
+
+
+def full_name(name):
+    '''
+    Normalize the name, and append the default TLD if the name doesn't end in a recognized TLD
+    '''
+    if isinstance(name, Name):
+        return str(name)
+    if isinstance(name, (bytes, bytearray)):
+        name = Web3.toText(name)
+    name = nameprep(name)
+    pieces = name.split('.')
+    if pieces[-1] not in RECOGNIZED_TLDS:
+        pieces.append(DEFAULT_TLD)
+    return '.'.join(pieces)
+
+
+def label_to_hash(label):
+    '''
+    @param label a normalized label, like 'foo'
+    @returns the 32-byte labelhash
+    '''
+    return keccak(label.encode())
+
+
+def labels_to_node(labels, nodes, labelhash=label_to_hash):
+    '''
+    Hash the labels of a full name into its node, starting from the closest parent in `nodes`
+
+    @param labels all normalized labels of a full name, like ['foo', 'eth']
+    @param nodes an LRUCache of label tuples to nodes, which gets the node of every hashed name
+    @param labelhash a function to hash each new label
+    '''
+    node, depth = EMPTY_SHA3_BYTES, len(labels)
+    for idx in range(len(labels)):
+        cached_node = nodes.get(tuple(labels[idx:]))
+        if cached_node is not None:
+            node, depth = cached_node, idx
+            break
+    for idx in reversed(range(depth)):
+        node = keccak(node + labelhash(labels[idx]))
+        nodes[tuple(labels[idx:])] = node
+    return node
+
+
+def labels_to_chain(labels, nodes, labelhash=label_to_hash):
+    '''
+    Hash the labels of a full name into the node of every name in its hierarchy, in one pass from
+    the TLD down to the full name. Like :func:`labels_to_node`, it reuses and fills `nodes`.
+
+    @returns a list of nodes, of the full name first and then each parent, like the nodes of
+        ['a.foo.eth', 'foo.eth', 'eth']
+    '''
+    chain = [None] * len(labels)
+    node = EMPTY_SHA3_BYTES
+    for idx in reversed(range(len(labels))):
+        key = tuple(labels[idx:])
+        cached_node = nodes.get(key)
+        if cached_node is None:
+            node = keccak(node + labelhash(labels[idx]))
+            nodes[key] = node
+        else:
+            node = cached_node
+        chain[idx] = node
+    return chain
+
+
+def namehash_many(names, cache_size=NAMEHASH_CACHE_SIZE):
+    '''
+    Generate the namehash of each name in `names`, in order, without a connection to web3.
+
+    Each distinct label is normalized and hashed only once, and the node of every parent name
+    is reused by the names below it, so sorting the names makes the caches most effective.
+
+    @param names an iterable of names (str, bytes or Name), expanded to full names like
+        `ENS.namehash` does
+    @param cache_size the number of labels, and separately of nodes, to remember
+    '''
+    prepped_labels = LRUCache(cache_size)
+    labelhashes = LRUCache(cache_size)
+    nodes = LRUCache(cache_size)
+
+    def labelhash(label):
+        hashed = labelhashes.get(label)
+        if hashed is None:
+            hashed = label_to_hash(label)
+            labelhashes[label] = hashed
+        return hashed
+
+    for name in names:
+        if isinstance(name, Name):
+            yield name.node
+        else:
+            yield labels_to_node(_prepped_labels(name, prepped_labels), nodes, labelhash)
+
+
+def _prepped_labels(name, cache):
+    '''
+    Split a name into normalized labels, including the default TLD if necessary, like
+    `full_name(name).split('.')`, but normalizing each label separately so that
+    labels shared between names are only normalized once.
+    '''
+    if isinstance(name, (bytes, bytearray)):
+        name = Web3.toText(name)
+    labels = []
+    for raw_label in UNICODE_DOTS.split(name):
+        label = cache.get(raw_label)
+        if label is None:
+            try:
+                label = nameprep(raw_label)
+            except InvalidName:
+                label = ''
+            cache[raw_label] = label
+        if not label:
+            # leave empty and invalid labels to the rules for the whole name, in full_name()
+            return full_name(name).split('.')
+        labels.append(label)
+    if labels[-1] not in RECOGNIZED_TLDS:
+        labels.append(DEFAULT_TLD)
+    return labels
+
+
+def init_web3(providers=None, freshness=None):
+    '''
+    @param freshness an optional :class:`~ens.middleware.FreshnessMonitor`, to share the latest
+        block seen with other requests
+    '''
     if not providers:
         providers = [IPCProvider(), HTTPProvider('http://localhost:8545')]
+    if freshness is None:
+        freshness = FreshnessMonitor()
     w3 = Web3(providers)
-    w3.middleware_stack.add(
-        make_stalecheck_middleware(ACCEPTABLE_STALE_HOURS * 3600),
-        name='stalecheck'
-    )
+    w3.middleware_stack.add(make_stalecheck_middleware(freshness), name='stalecheck')
     w3.eth.setContractFactory(ConciseContract)
     return w3
@@ -61,8 +61,16 @@ setup(
     # simple. Or you can use find_packages().
     packages=find_packages(exclude=['tests', 'venv']),
 
+    # contract ABIs, loaded on first use
+    package_data={'ens.abis': ['*.json']},
+
     # https://packaging.python.org/en/latest/requirements.html
-    install_requires=['pytz', 'web3>=3.16.1,<4'],
+    install_requires=['eth-utils>=0.7.1,<1', 'idna', 'pytz', 'web3>=3.16.1,<4'],
+
+    # for AsyncENS: pip install ens[async]
+    extras_require={
+        'async': ['aiohttp>=2.3,<4'],
+    },
 
     setup_requires=['setuptools-markdown'],
     long_description_markdown_filename='README.md',
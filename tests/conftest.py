@@ -3,15 +3,55 @@ import pytest
 from unittest.mock import Mock
 
 from web3 import Web3
+from web3.providers.base import BaseProvider
 from web3.providers.tester import EthereumTesterProvider
 
 from ens import ENS
+from ens.batch import SELECTORS
 
 
 def mkhash(num, digits=40):
     return '0x' + str(num) * digits
 
 
+def address_result(address):
+    '@returns the eth_call result that holds the address, or the zero word for None'
+    return '0x' + '0' * 24 + address[2:] if address else '0x' + '0' * 64
+
+
+class FakeProvider(BaseProvider):
+    '''
+    Answers every eth_call with the same address, or a ttl of 300, and counts the requests
+    '''
+
+    def __init__(self, address):
+        self.result = address_result(address)
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append(method)
+        if method == 'eth_getBlockByNumber':
+            return {'result': {'number': '0x1', 'timestamp': '0x5a000000'}}
+        if params[0]['data'].startswith(Web3.toHex(SELECTORS['ttl'])):
+            return {'result': '0x%064x' % 300}
+        return {'result': self.result}
+
+
+class BatchProvider(FakeProvider):
+    def make_batch_request(self, requests):
+        return [self.make_request(method, params) for method, params in requests]
+
+
+class FakeClock:
+    'A clock for the caches and middlewares, that only moves when a test sets :attr:`now`'
+
+    def __init__(self):
+        self.now = 1000
+
+    def __call__(self):
+        return self.now
+
+
 @pytest.fixture
 def addr1():
     return mkhash(1)
@@ -82,6 +122,17 @@ def secret1():
     return 'SUCH_SAFE_MUCH_SECRET'
 
 
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def provider(mocker, addr9):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    return FakeProvider(addr9)
+
+
 @pytest.fixture
 def ens(mocker):
     ens = ENS(EthereumTesterProvider())
@@ -111,6 +162,12 @@ def fake_hash(fake_hash_hexout):
     return lambda name: Web3.toBytes(hexstr=fake_hash_hexout(name))
 
 
+@pytest.fixture
+def fake_keccak(mocker, fake_hash):
+    for module in ('ens.utils', 'ens.registrar'):
+        mocker.patch('%s.keccak' % module, side_effect=fake_hash)
+
+
 @pytest.fixture
 def fake_hash_utf8(fake_hash):
     return lambda name: fake_hash(name.encode())
@@ -17,8 +17,7 @@ def test_bid_requires_from(reg_bid, label1, secret1):
         reg_bid.bid(label1, 1, secret1)
 
 
-def test_bid_nameprep(reg_bid, mocker, fake_hash_hexout, fake_hash_utf8, value1, secret1, addr1):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+def test_bid_nameprep(reg_bid, mocker, fake_keccak, fake_hash_utf8, value1, secret1, addr1):
     reg_bid.bid("ÖÖÖÖÖÖÖ.eth", value1, secret1, transact={'from': addr1})
     reg_bid.core.shaBid.assert_called_once_with(
         fake_hash_utf8("ööööööö"),
@@ -29,8 +28,7 @@ def test_bid_nameprep(reg_bid, mocker, fake_hash_hexout, fake_hash_utf8, value1,
 
 
 def test_bid_hash(
-        reg_bid, mocker, fake_hash_hexout, fake_hash_utf8, label1, value1, secret1, addr1):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+        reg_bid, mocker, fake_keccak, fake_hash_utf8, label1, value1, secret1, addr1):
     mocker.patch.object(reg_bid.ens, 'labelhash', side_effect=fake_hash_utf8)
     reg_bid.bid(label1, value1, secret1, transact={'from': addr1})
     reg_bid.core.shaBid.assert_called_once_with(
@@ -42,8 +40,7 @@ def test_bid_hash(
 
 
 def test_bid_convert_to_label(
-        reg_bid, mocker, fake_hash_hexout, fake_hash_utf8, value1, secret1, addr1):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+        reg_bid, mocker, fake_keccak, fake_hash_utf8, value1, secret1, addr1):
     reg_bid.bid('fullname.eth', value1, secret1, transact={'from': addr1})
     reg_bid.core.shaBid.assert_called_once_with(
         b"HASH(bfullname)",
@@ -92,3 +89,13 @@ def test_underfunded_bid(reg_bid, value1, addr1):
     underfund = value1
     with pytest.raises(UnderfundedBid):
         reg_bid.bid('', high_bid, '', transact={'from': addr1, 'value': underfund})
+
+
+def test_secret_hash_matches_web3_sha3(registrar, secret1):
+    expected = Web3.toBytes(hexstr=Web3.sha3(secret1.encode()))
+    assert registrar._secret_hash(secret1) == expected
+
+
+def test_secret_hash_int_matches_web3_sha3(registrar):
+    expected = Web3.toBytes(hexstr=Web3.sha3(12345))
+    assert registrar._secret_hash(12345) == expected
@@ -3,6 +3,7 @@ import pytest
 
 from web3.exceptions import StaleBlockchain
 
+from ens import Name, abis
 from ens.registrar import Status
 
 
@@ -23,6 +24,19 @@ def test_entries_use_label_with_dots(registrar, mocker, addr1, hash1, dot):
     registrar.ens.labelhash.assert_called_once_with('holygrail')
 
 
+def test_entries_name_object(registrar, mocker):
+    mocker.patch.object(registrar.ens, 'labelhash')
+    mocker.patch.object(registrar, 'entries_by_hash')
+    registrar.entries(Name('holygrail'))
+    registrar.ens.labelhash.assert_called_once_with('holygrail')
+
+
+def test_entries_name_object_subdomain_meaningless(registrar, mocker):
+    mocker.patch.object(registrar, 'entries_by_hash')
+    with pytest.raises(ValueError):
+        registrar.entries(Name('montypythonandthe.holygrail.eth'))
+
+
 def test_entries_subdomain_meaningless(registrar, mocker, addr1, hash1):
     mocker.patch.object(registrar.web3, 'sha3')
     mocker.patch.object(registrar, 'entries_by_hash')
@@ -46,6 +60,14 @@ def test_entries_deed_contract(registrar, mocker, addr1):
     assert entries[1]._classic_contract.address == addr1
 
 
+def test_entries_deed_contract_reused(registrar, mocker, addr1):
+    mocker.patch.object(registrar.core, 'entries', return_value=[0, addr1, 2, 3, 4])
+    deed_contract = registrar.web3.eth.contract(abi=abis.DEED)
+    mocker.patch.object(registrar, '_deedContract', wraps=deed_contract)
+    assert registrar.entries_by_hash(b'').deed is registrar.entries_by_hash(b'').deed
+    registrar._deedContract.assert_called_once_with(addr1)
+
+
 def test_entries_empty_deed(registrar, mocker):
     mocker.patch.object(registrar.core, 'entries', return_value=[0, None, 0, 0, 0])
     entries = registrar.entries_by_hash(b'')
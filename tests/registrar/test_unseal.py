@@ -33,11 +33,10 @@ def test_reveal_fails_on_seal_mismatch(unseal_registrar, mocker, label1, value1,
 
 
 def test_reveal_nameprep(
-        unseal_registrar, mocker, fake_hash, fake_hash_hexout, value1, secret1, addr1):
+        unseal_registrar, mocker, fake_hash, fake_keccak, value1, secret1, addr1):
     '''
     Must convert unicode letters to lowercase, and convert from full name to label
     '''
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
     unseal_registrar.reveal("ÖÖÖÖÖÖÖ.eth", value1, secret1, transact={'from': addr1})
     unseal_registrar.core.shaBid.assert_called_once_with(
         fake_hash("ööööööö".encode()),
@@ -48,8 +47,7 @@ def test_reveal_nameprep(
 
 
 def test_unseal_bid(
-        unseal_registrar, mocker, fake_hash, fake_hash_hexout, label1, value1, secret1, addr1):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+        unseal_registrar, mocker, fake_hash, fake_keccak, label1, value1, secret1, addr1):
     unseal_registrar.reveal(label1, value1, secret1, transact={'from': addr1})
     unseal_registrar.core.unsealBid.assert_called_once_with(
         fake_hash(label1.encode()),
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ens import abis
+from ens.abis import selector_table, tables, topic_table
+from ens.abis.__main__ import tables_source
+
+
+def test_abi_loaded_once():
+    assert abis.RESOLVER is abis.RESOLVER
+    assert any(entry.get('name') == 'addr' for entry in abis.RESOLVER)
+
+
+def test_unknown_abi():
+    with pytest.raises(AttributeError):
+        abis.NOT_A_CONTRACT
+
+
+def test_import_loads_no_abis():
+    code = "import ens; assert not set(vars(ens.abis)) & set(ens.abis.CONTRACTS)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.check_call([sys.executable, '-c', code], cwd=root)
+
+
+def test_ens_loads_no_registrar_abis():
+    code = (
+        "import ens; from web3.providers.tester import EthereumTesterProvider; "
+        "ens.ENS(EthereumTesterProvider()); "
+        "assert not {'AUCTION_REGISTRAR', 'DEED'} & set(vars(ens.abis))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.check_call([sys.executable, '-c', code], cwd=root)
+
+
+@pytest.mark.parametrize('contract', abis.CONTRACTS)
+def test_tables_match_abi(contract):
+    abi = getattr(abis, contract)
+    assert tables.SELECTORS[contract] == {
+        signature: '0x' + selector.hex() for signature, selector in selector_table(abi).items()
+    }
+    assert tables.TOPICS[contract] == {
+        signature: '0x' + topic.hex() for signature, topic in topic_table(abi).items()
+    }
+
+
+def test_tables_up_to_date():
+    with open(tables.__file__) as shipped:
+        assert shipped.read() == tables_source()
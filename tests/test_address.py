@@ -0,0 +1,81 @@
+import pickle
+
+import pytest
+from web3 import Web3
+
+from ens.utils import Address, checksum_if_address, ensure_hex, to_address
+
+CHECKSUMMED = '0x5B2063246F2191f18F2675ceDB8b28102e957458'
+
+
+def test_address_forms():
+    address = to_address(CHECKSUMMED)
+    assert address.raw == Web3.toBytes(hexstr=CHECKSUMMED)
+    assert address.hex == CHECKSUMMED.lower()
+    assert address.checksum == CHECKSUMMED
+    assert str(address) == CHECKSUMMED
+
+
+def test_address_interned():
+    address = to_address(CHECKSUMMED)
+    assert to_address(CHECKSUMMED.lower()) is address
+    assert to_address(CHECKSUMMED[2:]) is address
+    assert to_address(address.raw) is address
+    assert to_address(address) is address
+
+
+def test_address_checksums_once(mocker):
+    address = Address(b'\x01' * 20)
+    address.checksum
+    checksum = mocker.patch('web3.Web3.toChecksumAddress')
+    assert address.checksum == '0x' + '01' * 20
+    assert not checksum.called
+
+
+def test_address_immutable():
+    address = to_address(CHECKSUMMED)
+    with pytest.raises(AttributeError):
+        address.raw = b'\0' * 20
+    with pytest.raises(AttributeError):
+        address.email = 'lancelot@camelot'
+
+
+def test_address_pickles():
+    address = to_address(CHECKSUMMED)
+    assert pickle.loads(pickle.dumps(address)) == address
+
+
+@pytest.mark.parametrize('invalid', ['0x1234', 'holy.eth', b'\x01' * 19])
+def test_address_invalid(invalid):
+    with pytest.raises(ValueError):
+        to_address(invalid)
+
+
+def test_checksum_if_address():
+    assert checksum_if_address(CHECKSUMMED.lower()) == CHECKSUMMED
+    assert checksum_if_address('holy.eth') == 'holy.eth'
+    assert checksum_if_address(None) is None
+
+
+def test_ensure_hex_address(addrbytes1, addr1):
+    assert ensure_hex(addrbytes1) == addr1
+    assert ensure_hex(to_address(addr1)) == addr1
+    assert ensure_hex(b'\x01\x02') == '0x0102'
+
+
+def test_ensure_hex_int():
+    assert ensure_hex(5) == '0x5'
+
+
+def test_reverse_domain(ens):
+    expected = CHECKSUMMED[2:].lower() + '.addr.reverse'
+    assert ens.reverse_domain(CHECKSUMMED) == expected
+    assert ens.reverse_domain(to_address(CHECKSUMMED).raw) == expected
+
+
+def test_setup_address_noop_ignores_case(ens, mocker):
+    mocker.patch.object(ens, '_first_owner', return_value=(CHECKSUMMED, [], 'holy.eth'))
+    mocker.patch.object(ens, 'address', return_value=CHECKSUMMED)
+    mocker.patch.object(ens, '_claim_ownership')
+    assert ens.setup_address('holy.eth', CHECKSUMMED.lower()) is None
+    assert not ens._claim_ownership.called
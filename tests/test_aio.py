@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+import pytz
+from web3 import Web3
+from web3.exceptions import StaleBlockchain
+
+from ens import aio
+from ens.aio import AsyncENS, AsyncHTTPProvider
+from ens.batch import SELECTORS
+from ens.main import ENS_MAINNET_ADDR
+from ens.registrar import Status
+from .conftest import address_result
+
+LATEST_BLOCK = {'number': '0x10', 'timestamp': '0x5a000000'}
+
+
+def string_result(text):
+    encoded = text.encode()
+    return Web3.toHex(
+        (32).to_bytes(32, 'big') + len(encoded).to_bytes(32, 'big') + encoded.ljust(32, b'\0')
+    )
+
+
+class FakeProvider:
+    def __init__(self):
+        self.results = {}
+        self.requests = []
+
+    def set_result(self, contract, function, node, result):
+        data = Web3.toHex(SELECTORS[function] + node)
+        self.results[(contract, data)] = result
+
+    async def make_request(self, method, params):
+        self.requests.append(method)
+        if method == 'eth_getBlockByNumber':
+            return {'result': LATEST_BLOCK}
+        call = params[0]
+        return {'result': self.results.get((call['to'], call['data']), '0x')}
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+@pytest.fixture
+def provider(mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    return FakeProvider()
+
+
+@pytest.fixture
+def async_ens(provider):
+    return AsyncENS(provider)
+
+
+@pytest.fixture
+def holy_grail(async_ens, provider, addr1, addr9):
+    node = async_ens.namehash('holy.grail.eth')
+    provider.set_result(ENS_MAINNET_ADDR, 'resolver', node, address_result(addr9))
+    provider.set_result(Web3.toChecksumAddress(addr9), 'addr', node, address_result(addr1))
+    return node
+
+
+def test_async_address(async_ens, holy_grail, addr1):
+    assert run(async_ens.address('holy.grail.eth')) == Web3.toChecksumAddress(addr1)
+
+
+def test_async_address_without_resolver(async_ens):
+    assert run(async_ens.address('holy.grail.eth')) is None
+
+
+def test_async_name(async_ens, provider, addr1, addr9):
+    node = async_ens.namehash(async_ens.reverse_domain(addr1))
+    provider.set_result(ENS_MAINNET_ADDR, 'resolver', node, address_result(addr9))
+    provider.set_result(Web3.toChecksumAddress(addr9), 'name', node, string_result('holy.eth'))
+    assert run(async_ens.name(addr1)) == 'holy.eth'
+
+
+def test_async_owner_and_resolver(async_ens, provider, addr1, addr9):
+    node = async_ens.namehash('holy.eth')
+    provider.set_result(ENS_MAINNET_ADDR, 'owner', node, address_result(addr1))
+    provider.set_result(ENS_MAINNET_ADDR, 'resolver', node, address_result(addr9))
+    assert run(async_ens.owner('holy.eth')) == Web3.toChecksumAddress(addr1)
+    assert run(async_ens.resolver('holy.eth')) == Web3.toChecksumAddress(addr9)
+
+
+def test_async_hashing_matches_ens(async_ens, ens):
+    assert async_ens.namehash('Holy.Grail.eth') == ens.namehash('Holy.Grail.eth')
+    assert async_ens.reverse_domain('0x' + 'AB' * 20) == ens.reverse_domain('0x' + 'AB' * 20)
+
+
+def test_async_concurrent_lookups_share_stale_check(async_ens, provider):
+    lookups = [async_ens.address('holy%d.eth' % idx) for idx in range(10)]
+    assert run(asyncio.gather(*lookups)) == [None] * 10
+    assert provider.requests.count('eth_getBlockByNumber') == 1
+    assert provider.requests.count('eth_call') == 10
+
+
+def test_async_identical_lookups_coalesced(async_ens, provider, holy_grail, addr1):
+    lookups = [async_ens.address('holy.grail.eth') for _ in range(10)]
+    lookups += [async_ens.owner('holy.grail.eth') for _ in range(10)]
+    results = run(asyncio.gather(*lookups))
+    assert results == [Web3.toChecksumAddress(addr1)] * 10 + [None] * 10
+    assert provider.requests.count('eth_call') == 3
+
+
+def test_async_stale_check_reuses_latest_block(async_ens, provider, holy_grail):
+    run(async_ens.address('holy.grail.eth'))
+    run(async_ens.address('holy.grail.eth'))
+    assert provider.requests.count('eth_getBlockByNumber') == 1
+
+
+def test_async_stale(async_ens, provider, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=False)
+    for _ in range(2):
+        with pytest.raises(StaleBlockchain):
+            run(async_ens.address('holy.grail.eth'))
+    assert provider.requests == ['eth_getBlockByNumber']
+
+
+def test_async_entries(async_ens, provider, addr1, addr9):
+    registrar = Web3.toChecksumAddress(addr9)
+    provider.set_result(ENS_MAINNET_ADDR, 'owner', async_ens.namehash('eth'), address_result(addr9))
+    label_hash = async_ens.labelhash('holygrail')
+    entries_data = Web3.toHex(aio.ENTRIES_SELECTOR + label_hash)
+    provider.results[(registrar, entries_data)] = '0x' + ''.join([
+        '%064x' % 2,
+        address_result(addr1)[2:],
+        '%064x' % 1500000000,
+        '%064x' % 10,
+        '%064x' % 20,
+    ])
+    entries = run(async_ens.registrar.entries('holygrail.eth'))
+    assert entries.status == Status.Owned
+    assert entries.deed == Web3.toChecksumAddress(addr1)
+    assert entries.close_at == datetime.fromtimestamp(1500000000, pytz.utc)
+    assert (entries.deposit, entries.top_bid) == (10, 20)
+
+
+def test_async_http_provider_needs_aiohttp(mocker):
+    mocker.patch.object(aio, 'aiohttp', None)
+    with pytest.raises(ImportError):
+        AsyncHTTPProvider()
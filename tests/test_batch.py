@@ -0,0 +1,291 @@
+import json
+
+import pytest
+from web3 import HTTPProvider, Web3
+from web3.exceptions import StaleBlockchain
+from web3.providers.tester import EthereumTesterProvider
+
+from ens.batch import (
+    SELECTORS,
+    batch_node_calls,
+    batch_request,
+    decode_abi,
+    decode_address,
+    decode_bytes32,
+    decode_pubkey,
+    decode_string,
+    node_call,
+)
+from ens.records import Records
+from .conftest import address_result, mkhash
+
+
+def string_result(text):
+    encoded = text.encode() if isinstance(text, str) else text
+    padding = b'\0' * (-len(encoded) % 32)
+    words = (32).to_bytes(32, 'big') + len(encoded).to_bytes(32, 'big') + encoded + padding
+    return Web3.toHex(words)
+
+
+@pytest.fixture
+def fake_batch(ens, mocker):
+    '''
+    Answer batched eth_calls from `fake_batch.results`, keyed by (contract, function, name)
+    '''
+    results = {}
+
+    def answer(web3, requests, freshness=None, failed_result=None):
+        answer.round_trips += 1
+        answers = []
+        for method, params in requests:
+            assert method == 'eth_call'
+            call = params[0]
+            data = Web3.toBytes(hexstr=call['data'])
+            for (contract, function, name), result in results.items():
+                selected = SELECTORS[function] + ens.namehash(name)
+                if call['to'] == contract and data[:len(selected)] == selected:
+                    answers.append(result)
+                    break
+            else:
+                answers.append(address_result(mkhash(0)))
+        return answers
+    answer.round_trips = 0
+    answer.results = results
+    mocker.patch('ens.batch.batch_request', side_effect=answer)
+    return answer
+
+
+def test_address_many(ens, fake_batch, addr1, addr2, addr9):
+    registry = ens._ens_addr
+    fake_batch.results.update({
+        (registry, 'resolver', 'holy.eth'): address_result(addr9),
+        (registry, 'resolver', 'grail.eth'): address_result(addr9),
+        (addr9, 'addr', 'holy.eth'): address_result(addr1),
+    })
+    names = ['holy', 'grail.eth', 'unresolved.eth', 'holy.eth']
+    address = Web3.toChecksumAddress(addr1)
+    assert ens.address_many(names) == [address, None, None, address]
+    assert fake_batch.round_trips == 2
+
+
+def test_address_many_empty(ens, fake_batch):
+    assert ens.address_many([]) == []
+
+
+@pytest.fixture
+def reverse_records(ens, fake_batch, addr1, addr2, addr9):
+    '''
+    addr1 claims a name that resolves back to it, addr2 claims a name that resolves elsewhere,
+    and addr9 doesn't claim a name
+    '''
+    registry = ens._ens_addr
+    fake_batch.results.update({
+        (registry, 'resolver', ens.reverse_domain(addr1)): address_result(addr9),
+        (registry, 'resolver', ens.reverse_domain(addr2)): address_result(addr9),
+        (addr9, 'name', ens.reverse_domain(addr1)): string_result('holy.eth'),
+        (addr9, 'name', ens.reverse_domain(addr2)): string_result('grail.eth'),
+        (registry, 'resolver', 'holy.eth'): address_result(addr9),
+        (registry, 'resolver', 'grail.eth'): address_result(addr9),
+        (addr9, 'addr', 'holy.eth'): address_result(addr1),
+        (addr9, 'addr', 'grail.eth'): address_result(addr1),
+    })
+    return fake_batch
+
+
+def test_name_many_verified(ens, reverse_records, addr1, addr2, addr9, addrbytes1):
+    addresses = [addr1, addr2, addr9, addrbytes1]
+    assert ens.name_many(addresses) == ['holy.eth', None, None, 'holy.eth']
+    assert reverse_records.round_trips == 4
+
+
+def test_name_many_unverified(ens, reverse_records, addr1, addr2, addr9):
+    assert ens.name_many([addr1, addr2, addr9], verify=False) == ['holy.eth', 'grail.eth', None]
+    assert reverse_records.round_trips == 2
+
+
+def test_name_many_invalid_claim(ens, fake_batch, addr1, addr9):
+    fake_batch.results.update({
+        (ens._ens_addr, 'resolver', ens.reverse_domain(addr1)): address_result(addr9),
+        (addr9, 'name', ens.reverse_domain(addr1)): string_result('not=std3.eth'),
+    })
+    assert ens.name_many([addr1]) == [None]
+
+
+def test_name_many_undecodable_claim(ens, reverse_records, addr1, addr2, addr9):
+    reverse_records.results[(addr9, 'name', ens.reverse_domain(addr2))] = \
+        string_result(b'\xff\xfe')
+    assert ens.name_many([addr1, addr2]) == ['holy.eth', None]
+
+
+def abi_result(content_type, data):
+    padding = b'\0' * (-len(data) % 32)
+    words = content_type.to_bytes(32, 'big') + (64).to_bytes(32, 'big')
+    return Web3.toHex(words + len(data).to_bytes(32, 'big') + data + padding)
+
+
+def test_records(ens, fake_batch, addr1, addr9):
+    registry = ens._ens_addr
+    fake_batch.results.update({
+        (registry, 'resolver', 'holy.eth'): address_result(addr9),
+        (addr9, 'addr', 'holy.eth'): address_result(addr1),
+        (addr9, 'name', 'holy.eth'): string_result('holy.eth'),
+        (addr9, 'content', 'holy.eth'): '0x' + '01' * 32,
+        (addr9, 'ABI', 'holy.eth'): abi_result(1, b'[]'),
+        (addr9, 'pubkey', 'holy.eth'): '0x' + '02' * 32 + '03' * 32,
+    })
+    records = ens.records('holy.eth')
+    assert records == Records(
+        resolver=Web3.toChecksumAddress(addr9),
+        addr=Web3.toChecksumAddress(addr1),
+        name='holy.eth',
+        content=b'\x01' * 32,
+        ABI=(1, b'[]'),
+        pubkey=(b'\x02' * 32, b'\x03' * 32),
+    )
+    assert fake_batch.round_trips == 2
+
+
+def test_records_unset(ens, fake_batch, addr9):
+    fake_batch.results.update({
+        (ens._ens_addr, 'resolver', 'holy.eth'): address_result(addr9),
+        (addr9, 'name', 'holy.eth'): string_result(''),
+        (addr9, 'content', 'holy.eth'): '0x' + '00' * 32,
+        (addr9, 'ABI', 'holy.eth'): '0x' + '00' * 64,
+        (addr9, 'pubkey', 'holy.eth'): '0x' + '00' * 64,
+    })
+    assert ens.records('holy.eth') == Records(resolver=Web3.toChecksumAddress(addr9))
+
+
+def test_records_many(ens, fake_batch, addr1, addr9):
+    registry = ens._ens_addr
+    fake_batch.results.update({
+        (registry, 'resolver', 'holy.eth'): address_result(addr9),
+        (addr9, 'addr', 'holy.eth'): address_result(addr1),
+    })
+    records = ens.records_many(['holy.eth', 'unresolved.eth'], fields=['addr', 'pubkey'])
+    assert records[0].addr == Web3.toChecksumAddress(addr1)
+    assert records[0].pubkey is None
+    assert records[0].name is None
+    assert records[1] == Records()
+    assert fake_batch.round_trips == 2
+
+
+def test_records_unknown_field(ens):
+    with pytest.raises(ValueError):
+        ens.records('holy.eth', fields=['addr', 'email'])
+
+
+def test_records_slots():
+    with pytest.raises(AttributeError):
+        Records().email = 'lancelot@camelot'
+
+
+def test_node_call_uint_arguments(hashbytes1):
+    _, params = node_call('0x' + '00' * 20, 'ABI', hashbytes1, 15)
+    expected_data = SELECTORS['ABI'] + hashbytes1 + (15).to_bytes(32, 'big')
+    assert params[0]['data'] == Web3.toHex(expected_data)
+
+
+def test_decode_abi():
+    assert decode_abi(abi_result(2, b'compressed')) == (2, b'compressed')
+    assert decode_abi(abi_result(0, b'')) is None
+    assert decode_abi('0x') is None
+
+
+def test_decode_pubkey():
+    assert decode_pubkey('0x' + '00' * 64) is None
+    assert decode_pubkey('0x' + '00' * 32 + '01' * 32) == (b'\0' * 32, b'\x01' * 32)
+
+
+def test_decode_string():
+    assert decode_string(string_result('Öbb.eth')) == 'Öbb.eth'
+    assert decode_string(string_result('')) is None
+    assert decode_string('0x') is None
+    assert decode_string(string_result(b'\xff\xfe')) is None
+
+
+def test_decode_bytes32():
+    assert decode_bytes32('0x' + '01' * 32) == b'\x01' * 32
+    assert decode_bytes32('0x' + '00' * 32) is None
+    assert decode_bytes32('0x') is None
+
+
+def test_decode_address(addr1):
+    assert decode_address(address_result(addr1)) == Web3.toChecksumAddress(addr1)
+    assert decode_address(address_result(mkhash(0))) is None
+    assert decode_address('0x') is None
+
+
+@pytest.fixture
+def http_web3(mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    return Web3(HTTPProvider('http://localhost:8545'))
+
+
+def fake_post(responses):
+    def post(uri, data, **kwargs):
+        requests = json.loads(data.decode())
+        post.requests.append(requests)
+        replies = [{'jsonrpc': '2.0', 'id': req['id'], 'result': responses(req)} for req in requests]
+        return json.dumps(list(reversed(replies))).encode()
+    post.requests = []
+    return post
+
+
+def test_batch_request_over_http(http_web3, mocker):
+    def responses(request):
+        if request['method'] == 'eth_getBlockByNumber':
+            return {'number': '0x1', 'timestamp': '0x1'}
+        return request['params'][0]
+    post = fake_post(responses)
+    mocker.patch('ens.batch.make_post_request', side_effect=post)
+    assert batch_request(http_web3, [('eth_call', ['a']), ('eth_call', ['b'])]) == ['a', 'b']
+    assert len(post.requests) == 1
+    assert [req['method'] for req in post.requests[0]] == [
+        'eth_getBlockByNumber', 'eth_call', 'eth_call']
+
+
+def test_batch_request_stale(http_web3, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=False)
+    mocker.patch('ens.batch.make_post_request', side_effect=fake_post(
+        lambda request: {'number': '0x1', 'timestamp': '0x1'}))
+    with pytest.raises(StaleBlockchain):
+        batch_request(http_web3, [('eth_blockNumber', [])])
+
+
+def test_batch_request_error(http_web3, mocker):
+    def post(uri, data, **kwargs):
+        requests = json.loads(data.decode())
+        return json.dumps([{'id': req['id'], 'error': 'nope'} for req in requests]).encode()
+    mocker.patch('ens.batch.make_post_request', side_effect=post)
+    with pytest.raises(ValueError):
+        batch_request(http_web3, [('eth_blockNumber', [])])
+
+
+def test_batch_node_calls_error_in_batch(http_web3, mocker, addr1, addr2, hashbytes1):
+    def post(uri, data, **kwargs):
+        replies = []
+        for req in json.loads(data.decode()):
+            if req['method'] == 'eth_getBlockByNumber':
+                replies.append({'id': req['id'], 'result': {'number': '0x1', 'timestamp': '0x1'}})
+            elif req['params'][0]['to'] == addr2:
+                replies.append({'id': req['id'], 'error': {'code': -32000, 'message': 'revert'}})
+            else:
+                replies.append({'id': req['id'], 'result': address_result(addr1)})
+        return json.dumps(replies).encode()
+    mocker.patch('ens.batch.make_post_request', side_effect=post)
+    calls = [(addr1, 'addr', hashbytes1), (addr2, 'addr', hashbytes1), (addr1, 'name', hashbytes1)]
+    results = batch_node_calls(http_web3, calls)
+    assert results == [address_result(addr1), '0x', address_result(addr1)]
+    assert decode_address(results[1]) is None
+
+
+def test_batch_node_calls_batch_rejected(http_web3, mocker, addr1, hashbytes1):
+    mocker.patch('ens.batch.make_post_request', return_value=b'{"error": "too many"}')
+    with pytest.raises(ValueError):
+        batch_node_calls(http_web3, [(addr1, 'addr', hashbytes1)])
+
+
+def test_batch_request_without_batch_support():
+    web3 = Web3(EthereumTesterProvider())
+    assert batch_request(web3, [('eth_blockNumber', [])]) == [web3.eth.blockNumber]
@@ -0,0 +1,212 @@
+from unittest.mock import Mock
+
+import pytest
+from web3.providers.tester import EthereumTesterProvider
+
+from ens import ENS
+from ens.cache import NegativeCache, ResolutionCache
+
+
+@pytest.fixture
+def cache(clock):
+    return ResolutionCache(maxsize=2, min_ttl=10, max_ttl=100, clock=clock)
+
+
+def test_cache_uses_registry_ttl(cache, clock, hashbytes1):
+    cache.put(hashbytes1, 'addr', 'lancelot', ttl=50)
+    clock.now += 49
+    assert cache.get(hashbytes1, 'addr') == 'lancelot'
+    clock.now += 1
+    assert cache.get(hashbytes1, 'addr') is None
+    assert hashbytes1 not in cache
+
+
+@pytest.mark.parametrize('ttl, lifetime', [(0, 10), (5, 10), (1000, 100)])
+def test_cache_ttl_bounds(cache, clock, hashbytes1, ttl, lifetime):
+    cache.put(hashbytes1, 'addr', 'lancelot', ttl=ttl)
+    clock.now += lifetime - 1
+    assert hashbytes1 in cache
+    clock.now += 1
+    assert hashbytes1 not in cache
+
+
+def test_cache_without_floor_skips_ttl_zero(clock, hashbytes1):
+    cache = ResolutionCache(min_ttl=0, clock=clock)
+    cache.put(hashbytes1, 'addr', 'lancelot', ttl=0)
+    assert hashbytes1 not in cache
+
+
+def test_cache_records_expire_with_node(cache, clock, hashbytes1):
+    cache.put(hashbytes1, 'resolver', 'robin', ttl=50)
+    clock.now += 40
+    cache.put(hashbytes1, 'addr', 'lancelot', ttl=50)
+    clock.now += 10
+    assert cache.get(hashbytes1, 'addr') is None
+
+
+def test_cache_evicts_least_recently_used(cache, hashbytes1, hashbytes9):
+    cache.put(hashbytes1, 'addr', 'lancelot')
+    cache.put(hashbytes9, 'addr', 'galahad')
+    cache.get(hashbytes1, 'addr')
+    cache.put(b'', 'addr', 'robin')
+    assert hashbytes1 in cache
+    assert hashbytes9 not in cache
+
+
+def test_cache_evict(cache, hashbytes1):
+    cache.put(hashbytes1, 'addr', 'lancelot')
+    cache.evict(hashbytes1)
+    assert cache.get(hashbytes1, 'addr') is None
+
+
+def test_cache_invalid_bounds():
+    with pytest.raises(ValueError):
+        ResolutionCache(min_ttl=10, max_ttl=1)
+
+
+@pytest.fixture
+def cached_ens(ens, mocker, cache, addr1, addr9):
+    ens.cache = cache
+    resolver = Mock()
+    resolver.addr.return_value = addr1
+    mocker.patch.object(ens, '_resolverContract', return_value=resolver)
+    mocker.patch.object(ens.ens, 'resolver', return_value=addr9)
+    mocker.patch.object(ens.ens, 'ttl', return_value=50)
+    return ens
+
+
+def test_address_cached(cached_ens, clock, addr1):
+    resolver = cached_ens._resolverContract()
+    assert cached_ens.address('holy.eth') == cached_ens.address('holy.eth')
+    assert resolver.addr.call_count == 1
+    assert cached_ens.ens.resolver.call_count == 1
+    assert cached_ens.ens.ttl.call_count == 1
+    clock.now += 50
+    cached_ens.address('holy.eth')
+    assert resolver.addr.call_count == 2
+
+
+def test_fixed_lifetime_skips_ttl(cached_ens, clock):
+    cached_ens.cache = ResolutionCache(min_ttl=30, max_ttl=30, clock=clock)
+    cached_ens.address('holy.eth')
+    assert cached_ens.address('holy.eth') is not None
+    assert not cached_ens.ens.ttl.called
+
+
+def test_uncacheable_ttl_not_read_again(cached_ens, clock):
+    cached_ens.cache = ResolutionCache(min_ttl=0, max_ttl=100, clock=clock)
+    cached_ens.ens.ttl.return_value = 0
+    cached_ens.address('holy.eth')
+    cached_ens.address('holy.eth')
+    assert cached_ens.ens.ttl.call_count == 1
+    assert cached_ens.ens.resolver.call_count == 2
+    clock.now += 100
+    cached_ens.address('holy.eth')
+    assert cached_ens.ens.ttl.call_count == 2
+
+
+def test_uncacheable_ttl_read_again_during_lookups(cached_ens, clock):
+    cached_ens.cache = ResolutionCache(min_ttl=0, max_ttl=100, clock=clock)
+    cached_ens.ens.ttl.return_value = 0
+    for _ in range(5):
+        cached_ens.address('holy.eth')
+        clock.now += 30
+    assert cached_ens.ens.ttl.call_count == 2
+    cached_ens.ens.ttl.return_value = 3600
+    clock.now += 90
+    cached_ens.address('holy.eth')
+    resolver_calls = cached_ens.ens.resolver.call_count
+    cached_ens.address('holy.eth')
+    assert cached_ens.ens.resolver.call_count == resolver_calls
+
+
+def test_uncacheable_forgotten_on_evict(clock, hashbytes1):
+    cache = ResolutionCache(min_ttl=0, clock=clock)
+    cache.put(hashbytes1, 'addr', 'lancelot', ttl=0)
+    assert not cache.needs_ttl(hashbytes1)
+    cache.evict(hashbytes1)
+    assert cache.needs_ttl(hashbytes1)
+
+
+def test_resolver_not_cached_without_resolver(cached_ens):
+    cached_ens.ens.resolver.return_value = None
+    assert cached_ens.resolver('holy.eth') is None
+    assert cached_ens.resolver('holy.eth') is None
+    assert cached_ens.ens.resolver.call_count == 2
+
+
+def test_ens_cache_opt_in(ens):
+    assert ens.cache is None
+    assert isinstance(ENS(EthereumTesterProvider(), cache=True).cache, ResolutionCache)
+
+
+@pytest.fixture
+def negative_cache(clock):
+    return NegativeCache(maxsize=2, ttl=10, clock=clock)
+
+
+def test_negative_cache_expires(negative_cache, clock, hashbytes1):
+    negative_cache.put(hashbytes1, 'addr')
+    assert negative_cache.is_missing(hashbytes1, 'addr')
+    assert not negative_cache.is_missing(hashbytes1, 'name')
+    clock.now += 10
+    assert not negative_cache.is_missing(hashbytes1, 'addr')
+
+
+def test_negative_cache_evict(negative_cache, hashbytes1):
+    negative_cache.put(hashbytes1, 'resolver')
+    negative_cache.evict(hashbytes1)
+    assert hashbytes1 not in negative_cache
+
+
+@pytest.fixture
+def negative_ens(ens, mocker, negative_cache):
+    ens.negative_cache = negative_cache
+    mocker.patch.object(ens.ens, 'resolver', return_value=None)
+    return ens
+
+
+def test_missing_resolver_remembered(negative_ens, clock):
+    assert negative_ens.address('holy.eth') is None
+    assert negative_ens.address('holy.eth') is None
+    assert negative_ens.ens.resolver.call_count == 1
+    clock.now += 10
+    negative_ens.address('holy.eth')
+    assert negative_ens.ens.resolver.call_count == 2
+
+
+def test_zero_address_remembered(negative_ens, mocker, addr9):
+    negative_ens.ens.resolver.return_value = addr9
+    resolver = Mock()
+    resolver.addr.return_value = None
+    mocker.patch.object(negative_ens, '_resolverContract', return_value=resolver)
+    assert negative_ens.address('holy.eth') is None
+    assert negative_ens.address('holy.eth') is None
+    assert resolver.addr.call_count == 1
+    assert negative_ens.ens.resolver.call_count == 1
+
+
+def test_missing_reverse_record_remembered(negative_ens, addr1):
+    assert negative_ens.name(addr1) is None
+    assert negative_ens.name(addr1) is None
+    assert negative_ens.ens.resolver.call_count == 1
+
+
+def test_missing_forgotten_on_change(negative_ens):
+    negative_ens.address('holy.eth')
+    negative_ens._forget(negative_ens.namehash('holy.eth'))
+    negative_ens.address('holy.eth')
+    assert negative_ens.ens.resolver.call_count == 2
+
+
+def test_missing_reverse_record_forgotten_on_setup(negative_ens, mocker, addr1):
+    negative_ens.name(addr1)
+    mocker.patch.object(negative_ens, '_reverse_registrar')
+    negative_ens._setup_reverse('holy.eth', addr1)
+    negative_ens.name(addr1)
+    assert negative_ens.ens.resolver.call_count == 2
+
+
+def test_negative_cache_opt_in(ens):
+    assert ens.negative_cache is None
+    assert isinstance(ENS(EthereumTesterProvider(), negative_cache=True).negative_cache, NegativeCache)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from unittest.mock import Mock
+
+from ens.coalesce import AsyncSingleFlight, SingleFlight
+
+
+def test_single_flight_shares_concurrent_calls():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def lookup():
+        started.set()
+        release.wait()
+        return 'lancelot'
+
+    lookup = Mock(side_effect=lookup)
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('holy.eth', lookup)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(flights.do('holy.eth', lookup)))
+        for _ in range(4)
+    ]
+    for follower in followers:
+        follower.start()
+        # the follower waits for the leader
+        follower.join(0.01)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+    assert results == ['lancelot'] * 5
+    assert lookup.call_count == 1
+
+
+def test_single_flight_sequential_calls_not_shared():
+    flights = SingleFlight()
+    lookup = Mock(return_value='lancelot')
+    flights.do('holy.eth', lookup)
+    flights.do('holy.eth', lookup)
+    assert lookup.call_count == 2
+
+
+def test_single_flight_shares_exception():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def lookup():
+        started.set()
+        release.wait()
+        raise ValueError('ni')
+
+    def follow():
+        try:
+            flights.do('holy.eth', lookup)
+        except ValueError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=follow)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=follow)
+    follower.start()
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2
+
+
+def test_async_single_flight_shares_concurrent_calls():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def lookup(name):
+        calls.append(name)
+        await asyncio.sleep(0)
+        return name.upper()
+
+    lookups = [flights.do(('addr', 'holy.eth'), lookup, 'holy.eth') for _ in range(5)]
+    lookups.append(flights.do(('addr', 'grail.eth'), lookup, 'grail.eth'))
+    results = asyncio.get_event_loop().run_until_complete(asyncio.gather(*lookups))
+    assert results == ['HOLY.ETH'] * 5 + ['GRAIL.ETH']
+    assert sorted(calls) == ['grail.eth', 'holy.eth']
+
+
+def test_async_single_flight_shares_exception():
+    flights = AsyncSingleFlight()
+
+    async def lookup():
+        await asyncio.sleep(0)
+        raise ValueError('ni')
+
+    lookups = asyncio.gather(flights.do('holy.eth', lookup), flights.do('holy.eth', lookup),
+                             return_exceptions=True)
+    errors = asyncio.get_event_loop().run_until_complete(lookups)
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+
+
+def test_ens_coalesces_lookups(ens, mocker, addr9):
+    started, release = threading.Event(), threading.Event()
+
+    def owner(node):
+        started.set()
+        release.wait()
+        return addr9
+
+    mocker.patch.object(ens.ens, 'owner', side_effect=owner)
+    results = []
+    first = threading.Thread(target=lambda: results.append(ens.owner('holy.eth')))
+    first.start()
+    started.wait()
+    second = threading.Thread(target=lambda: results.append(ens.owner('holy.eth')))
+    second.start()
+    # the second lookup waits for the first
+    second.join(0.05)
+    release.set()
+    first.join()
+    second.join()
+    assert results == [addr9, addr9]
+    assert ens.ens.owner.call_count == 1
+
+
+def test_ens_pinned_lookups_not_coalesced_with_latest(ens):
+    latest_key = ens._flight_key('owner', b'node')
+    with ens.at_block(7):
+        assert ens._flight_key('owner', b'node') != latest_key
@@ -0,0 +1,59 @@
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+
+from ens.batch import SELECTORS
+from ens.fastpath import FastContract
+from .conftest import address_result
+
+CONTRACT_ADDR = '0x' + '12' * 20
+
+
+@pytest.fixture
+def contract():
+    return Mock(_classic_contract=Mock(address=CONTRACT_ADDR))
+
+
+@pytest.fixture
+def web3():
+    return Mock()
+
+
+def test_fast_call(contract, web3, hashbytes1, addr1):
+    web3.manager.request_blocking.return_value = address_result(addr1)
+    fast = FastContract(contract, web3)
+    assert fast.resolver(hashbytes1) == Web3.toChecksumAddress(addr1)
+    web3.manager.request_blocking.assert_called_once_with('eth_call', [
+        {'to': CONTRACT_ADDR, 'data': Web3.toHex(SELECTORS['resolver'] + hashbytes1)},
+        'latest',
+    ])
+    assert not contract.resolver.called
+
+
+def test_fast_call_zero_address(contract, web3, hashbytes1):
+    web3.manager.request_blocking.return_value = address_result(None)
+    assert FastContract(contract, web3).owner(hashbytes1) is None
+
+
+@pytest.mark.parametrize('call', [
+    lambda fast, node: fast.owner(node, transact={}),
+    lambda fast, node: fast.owner(node.hex()),
+    lambda fast, node: fast.setOwner(node, CONTRACT_ADDR),
+])
+def test_unusual_calls_use_contract(contract, web3, hashbytes1, call):
+    call(FastContract(contract, web3), hashbytes1)
+    assert not web3.manager.request_blocking.called
+
+
+def test_unusual_result_uses_contract(contract, web3, hashbytes1):
+    web3.manager.request_blocking.return_value = '0x'
+    assert FastContract(contract, web3).addr(hashbytes1) is contract.addr.return_value
+    contract.addr.assert_called_once_with(hashbytes1)
+
+
+def test_contract_without_address(web3, hashbytes1):
+    contract = Mock()
+    FastContract(contract, web3).addr(hashbytes1)
+    assert not web3.manager.request_blocking.called
+    contract.addr.assert_called_once_with(hashbytes1)
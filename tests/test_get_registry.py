@@ -4,14 +4,15 @@ import pytest
 
 from web3 import Web3
 from web3.exceptions import StaleBlockchain
+from web3.providers.tester import EthereumTesterProvider
 
+from ens import ENS, Name
 from ens.constants import EMPTY_SHA3_BYTES
 
 from .conftest import mkhash
 
 
-def test_namehash_three_labels(ens, mocker, fake_hash, fake_hash_hexout):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+def test_namehash_three_labels(ens, mocker, fake_hash, fake_keccak):
     namehash = ens.namehash('grail.seeker.eth')
     assert namehash == fake_hash(
         fake_hash(
@@ -25,8 +26,7 @@ def test_namehash_three_labels(ens, mocker, fake_hash, fake_hash_hexout):
     )
 
 
-def test_namehash_nameprep(ens, mocker, fake_hash, fake_hash_hexout):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+def test_namehash_nameprep(ens, mocker, fake_hash, fake_keccak):
     uhash = ens.namehash('Öbb.eth')
     assert uhash == fake_hash(
         fake_hash(
@@ -37,8 +37,7 @@ def test_namehash_nameprep(ens, mocker, fake_hash, fake_hash_hexout):
     )
 
 
-def test_namehash_expand(ens, mocker, fake_hash, fake_hash_hexout):
-    mocker.patch('web3.Web3.sha3', side_effect=fake_hash_hexout)
+def test_namehash_expand(ens, mocker, fake_hash, fake_keccak):
     uhash = ens.namehash('circus')
     assert uhash == fake_hash(
         fake_hash(
@@ -60,6 +59,42 @@ def test_namehash_result(ens):
     assert hash_hex == '0xf55bac2e53e0b47ee3a29324e114fc0996e651542abff256fa1daab5a68f1ff6'
 
 
+def test_namehash_cached(ens, mocker):
+    expected = ens.namehash('knights.who.say.eth')
+    mocker.patch.object(ens, 'labelhash')
+    assert ens.namehash('knights.who.say.eth') == expected
+    assert not ens.labelhash.called
+
+
+def test_namehash_reuses_parent_node(ens, mocker):
+    ens.namehash('who.say.eth')
+    mocker.patch.object(ens, 'labelhash', wraps=ens.labelhash)
+    namehash = ens.namehash('ni.who.say.eth')
+    ens.labelhash.assert_called_once_with('ni')
+    assert namehash == ENS(EthereumTesterProvider()).namehash('ni.who.say.eth')
+
+
+def test_namehash_many(ens):
+    names = ['flying.circus.eth', 'circus', 'spamalot']
+    assert list(ens.namehash_many(names)) == [ens.namehash(name) for name in names]
+
+
+def test_namehash_of_name_object(ens, mocker):
+    name = Name('flying.circus')
+    mocker.patch.object(ens, 'labelhash')
+    assert ens.namehash(name) == name.node
+    assert not ens.labelhash.called
+
+
+def test_namehash_chain(ens):
+    assert ens.namehash_chain('grail.seeker') == [
+        ens.namehash('grail.seeker.eth'),
+        ens.namehash('seeker.eth'),
+        ens.namehash('eth'),
+    ]
+    assert ens.namehash_chain(Name('grail.seeker')) == ens.namehash_chain('grail.seeker')
+
+
 @pytest.mark.parametrize("alternate_dot", ['．', '。', '｡'])
 def test_namehash_alternate_dots(ens, alternate_dot):
     assert ens.namehash('gallahad' + alternate_dot + 'eth') == ens.namehash('gallahad.eth')
@@ -72,6 +107,15 @@ def test_resolver(ens, mocker, hash1, addr1):
     ens.ens.resolver.assert_called_once_with(hash1)
 
 
+def test_resolver_reused(ens, mocker, addr1):
+    mocker.patch.object(ens.ens, 'resolver', return_value=addr1)
+    mocker.patch.object(ens, '_resolverContract', wraps=ens._resolverContract)
+    resolver = ens.resolver('holy.eth')
+    assert ens.resolver('grail.eth') is resolver
+    assert ens.reverser(addr1) is resolver
+    ens._resolverContract.assert_called_once_with(address=addr1)
+
+
 def test_resolver_empty(ens):
     with patch.object(ens.ens, 'resolver', return_value=None):
         assert ens.resolver('') is None
@@ -127,6 +171,13 @@ def test_owner_passthrough_namehash_result(ens, mocker, hash1):
     ens.ens.owner.assert_called_once_with(hash1)
 
 
+def test_owner_of_name_object(ens, mocker, addr1):
+    name = Name('different')
+    mocker.patch.object(ens.ens, 'owner', return_value=addr1)
+    assert ens.owner(name) == addr1
+    ens.ens.owner.assert_called_once_with(name.node)
+
+
 def test_owner_stale(ens, mocker):
     mocker.patch('web3.middleware.stalecheck._isfresh', return_value=False)
     with pytest.raises(StaleBlockchain):
@@ -0,0 +1,114 @@
+import pytest
+
+from ens import ENS
+from ens.instrument import Histogram, Observer, Stats
+
+from .conftest import BatchProvider
+
+
+class Recorder(Observer):
+    def __init__(self):
+        self.events = []
+
+    def operation_started(self, name, args=(), kwargs=None):
+        self.events.append(('start', name))
+
+    def operation_finished(self, name, seconds, error):
+        self.events.append(('finish', name))
+
+    def rpc(self, method, seconds, request_size, response_size, batched=(), params=None):
+        self.events.append(('rpc', method))
+
+
+def test_stats_count_requests(provider):
+    ens = ENS(provider, stats=True)
+    ens.address('holy.grail.eth')
+    stats = ens.stats.as_dict()
+    # nested public calls, like resolver(), count toward address()
+    assert list(stats) == ['ENS.address']
+    address = stats['ENS.address']
+    assert address['calls'] == 1
+    assert address['errors'] == 0
+    assert address['latency']['count'] == 1
+    assert address['rpc']['eth_call']['requests'] == provider.requests.count('eth_call') == 2
+    assert address['rpc']['eth_call']['request_bytes'] == 0
+
+
+def test_stats_count_bytes(provider):
+    ens = ENS(provider, stats=Stats(count_bytes=True))
+    ens.address('holy.grail.eth')
+    eth_call = ens.stats.as_dict()['ENS.address']['rpc']['eth_call']
+    assert eth_call['request_bytes'] > 0
+    assert eth_call['response_bytes'] > 0
+
+
+def test_stats_count_cache_lookups(provider):
+    ens = ENS(provider, cache=True, stats=True)
+    ens.address('holy.grail.eth')
+    ens.address('holy.grail.eth')
+    address = ens.stats.as_dict()['ENS.address']
+    assert address['calls'] == 2
+    assert address['cache']['resolution'] == {'hits': 1, 'misses': 2}
+
+
+def test_stats_count_batches(mocker, addr9):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    ens = ENS(BatchProvider(addr9), stats=True)
+    ens.address_many(['holy.eth', 'grail.eth'])
+    rpc = ens.stats.as_dict()['ENS.address_many']['rpc']
+    assert rpc['batch']['requests'] == 2
+    assert rpc['eth_call']['batched'] == 4
+    assert rpc['eth_call']['requests'] == 0
+
+
+def test_stats_count_errors(provider, mocker):
+    ens = ENS(provider, stats=Stats())
+    mocker.patch.object(ens, 'namehash', side_effect=ValueError)
+    with pytest.raises(ValueError):
+        ens.owner('holy.eth')
+    assert ens.stats.as_dict()['ENS.owner']['errors'] == 1
+
+
+def test_stats_added_mid_operation(provider, mocker):
+    ens = ENS(provider, trace=True)
+    stats = Stats()
+    namehash = ens.namehash
+
+    def add_stats(name):
+        ens.observers.append(stats)
+        return namehash(name)
+    mocker.patch.object(ens, 'namehash', side_effect=add_stats)
+    ens.owner('holy.eth')
+    assert stats.as_dict() == {}
+
+
+def test_observer_sees_nested_operations(provider):
+    ens = ENS(provider)
+    recorder = Recorder()
+    ens.observers.append(recorder)
+    ens.owner('holy.eth')
+    assert recorder.events == [
+        ('start', 'ENS.owner'),
+        ('rpc', 'eth_getBlockByNumber'),
+        ('rpc', 'eth_call'),
+        ('finish', 'ENS.owner'),
+    ]
+
+
+def test_requests_outside_operations_not_observed(provider):
+    ens = ENS(provider)
+    recorder = Recorder()
+    ens.observers.append(recorder)
+    ens.ens.owner(ens.namehash('holy.eth'))
+    assert recorder.events == []
+
+
+def test_histogram():
+    histogram = Histogram(bounds=(1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+    assert histogram.as_dict() == {
+        'count': 4,
+        'sum': 56.5,
+        'buckets': {'1': 2, '10': 1, '+Inf': 1},
+    }
@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+
+from ens.constants import INVALIDATION_MAX_BLOCKS
+from ens.invalidator import REGISTRY_TOPICS, RESOLVER_TOPICS, CacheInvalidator, changed_node
+from ens.utils import keccak
+
+
+def topic(topics, event_name):
+    return next(hexstr for hexstr, name in topics.items() if name == event_name)
+
+
+def event_log(topic0, *args):
+    return {'topics': [topic0] + [Web3.toHex(arg) for arg in args], 'data': '0x'}
+
+
+@pytest.fixture
+def chain(ens, mocker):
+    chain = Mock()
+    chain.eth.blockNumber = 10
+    chain.manager.request_blocking.return_value = []
+    mocker.patch.object(ens, 'web3', chain)
+    ens.cache = Mock()
+    return chain
+
+
+@pytest.fixture
+def invalidator(ens, chain):
+    return CacheInvalidator(ens)
+
+
+def test_changed_node_newowner_is_subnode(hashbytes1, hashbytes9):
+    log = event_log(topic(REGISTRY_TOPICS, 'NewOwner'), hashbytes1, hashbytes9)
+    assert changed_node(log) == keccak(hashbytes1 + hashbytes9)
+
+
+@pytest.mark.parametrize(
+    'topics, event_name',
+    [
+        (REGISTRY_TOPICS, 'NewResolver'),
+        (REGISTRY_TOPICS, 'Transfer'),
+        (REGISTRY_TOPICS, 'NewTTL'),
+        (RESOLVER_TOPICS, 'AddrChanged'),
+        (RESOLVER_TOPICS, 'NameChanged'),
+        (RESOLVER_TOPICS, 'ContentChanged'),
+        (RESOLVER_TOPICS, 'ABIChanged'),
+        (RESOLVER_TOPICS, 'PubkeyChanged'),
+    ],
+)
+def test_changed_node(topics, event_name, hashbytes1):
+    assert changed_node(event_log(topic(topics, event_name), hashbytes1)) == hashbytes1
+
+
+def test_newowner_topic():
+    newowner_topic = '0xce0457fe73731f824cc272376169235128c118b49d344817417c6d108d155e82'
+    assert topic(REGISTRY_TOPICS, 'NewOwner') == newowner_topic
+
+
+def test_poll_waits_for_new_block(invalidator, chain):
+    assert invalidator.poll() == []
+    assert not chain.manager.request_blocking.called
+
+
+def test_poll_evicts_changed_nodes(ens, invalidator, chain, hashbytes1, hashbytes9):
+    chain.eth.blockNumber = 12
+    chain.manager.request_blocking.side_effect = [
+        [event_log(topic(REGISTRY_TOPICS, 'NewResolver'), hashbytes1)],
+        [event_log(topic(RESOLVER_TOPICS, 'AddrChanged'), hashbytes9)],
+    ]
+    assert invalidator.poll() == [hashbytes1, hashbytes9]
+    assert ens.cache.evict.call_args_list == [((hashbytes1, ), ), ((hashbytes9, ), )]
+
+    registry_filter = chain.manager.request_blocking.call_args_list[0][0][1][0]
+    assert registry_filter['address'] == ens._ens_addr
+    assert (registry_filter['fromBlock'], registry_filter['toBlock']) == ('0xb', '0xc')
+    resolver_filter = chain.manager.request_blocking.call_args_list[1][0][1][0]
+    assert 'address' not in resolver_filter
+
+    chain.manager.request_blocking.side_effect = None
+    chain.eth.blockNumber = 13
+    invalidator.poll()
+    next_filter = chain.manager.request_blocking.call_args[0][1][0]
+    assert (next_filter['fromBlock'], next_filter['toBlock']) == ('0xd', '0xd')
+
+
+def test_poll_clears_cache_after_long_gap(ens, invalidator, chain):
+    chain.eth.blockNumber = 10 + INVALIDATION_MAX_BLOCKS + 1
+    assert invalidator.poll() is None
+    ens.cache.clear.assert_called_once_with()
+    assert not chain.manager.request_blocking.called
@@ -0,0 +1,185 @@
+from unittest.mock import Mock
+
+import pytest
+from web3.exceptions import StaleBlockchain
+
+from ens.middleware import (
+    BlockPins,
+    FreshnessMonitor,
+    make_block_pin_middleware,
+    make_stalecheck_middleware,
+)
+
+
+@pytest.fixture
+def pins():
+    return BlockPins()
+
+
+@pytest.fixture
+def make_request():
+    return Mock(return_value={'result': '0x01'})
+
+
+@pytest.fixture
+def pinned_request(pins, make_request):
+    return make_block_pin_middleware(pins)(make_request, None)
+
+
+def test_unpinned_reads_pass_through(pinned_request, make_request):
+    params = [{'to': '0x0', 'data': '0x'}, 'latest']
+    pinned_request('eth_call', params)
+    pinned_request('eth_call', params)
+    make_request.assert_called_with('eth_call', params)
+    assert make_request.call_count == 2
+
+
+def test_pinned_reads_use_block(pins, pinned_request, make_request):
+    with pins.pinned(5):
+        pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+        pinned_request('eth_getStorageAt', ['0x0', '0x0'])
+    assert make_request.call_args_list[0][0] == ('eth_call', [{'to': '0x0', 'data': '0x'}, '0x5'])
+    assert make_request.call_args_list[1][0] == ('eth_getStorageAt', ['0x0', '0x0', '0x5'])
+
+
+def test_pinned_reads_memoized(pins, pinned_request, make_request):
+    with pins.pinned(5):
+        pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+        pinned_request('eth_call', [{'data': '0x', 'to': '0x0'}])
+        with pins.pinned(5):
+            pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+        with pins.pinned(6):
+            pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+    assert make_request.call_count == 2
+    with pins.pinned(5):
+        pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+    assert make_request.call_count == 3
+
+
+def test_pinned_errors_not_memoized(pins, pinned_request, make_request):
+    make_request.return_value = {'error': 'nope'}
+    with pins.pinned(5):
+        pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+        pinned_request('eth_call', [{'to': '0x0', 'data': '0x'}, 'latest'])
+    assert make_request.call_count == 2
+
+
+def test_pinned_writes_pass_through(pins, pinned_request, make_request):
+    with pins.pinned(5):
+        pinned_request('eth_sendTransaction', [{'to': '0x0'}])
+        pinned_request('eth_sendTransaction', [{'to': '0x0'}])
+    make_request.assert_called_with('eth_sendTransaction', [{'to': '0x0'}])
+    assert make_request.call_count == 2
+
+
+def test_ens_at_block(ens):
+    assert ens._pins.block_identifier() == 'latest'
+    with ens.at_block(3):
+        assert ens._pins.block_identifier() == '0x3'
+        with ens.at_block('earliest'):
+            assert ens._pins.block_identifier() == '0x0'
+        assert ens._pins.block_identifier() == '0x3'
+    assert ens._pins.block_identifier() == 'latest'
+
+
+def test_ens_at_latest_block(ens):
+    with ens.at_block():
+        assert ens._pins.current.number == ens.web3.eth.blockNumber
+
+
+def test_ens_at_invalid_block(ens):
+    with pytest.raises(TypeError):
+        ens.at_block('pending')
+
+
+def test_ens_block_identifier_keyword(ens, mocker):
+    blocks = []
+
+    def owner(node):
+        blocks.append(ens._pins.block_identifier())
+
+    mocker.patch.object(ens.ens, 'owner', side_effect=owner)
+    ens.owner('holy.eth', block_identifier=7)
+    ens.owner('holy.eth')
+    assert blocks == ['0x7', 'latest']
+
+
+def test_ens_pinned_read_skips_cache(ens, mocker, addr1, addr9):
+    ens.cache = Mock()
+    mocker.patch.object(ens.ens, 'resolver', return_value=addr9)
+    mocker.patch.object(ens, '_resolverContract')
+    with ens.at_block(7):
+        ens.resolver('holy.eth')
+    assert not ens.cache.method_calls
+
+
+def test_registrar_block_identifier_keyword(registrar, mocker):
+    at_block = mocker.spy(registrar.ens, 'at_block')
+    mocker.patch.object(registrar.core, 'entries', return_value=(0, None, 0, 0, 0))
+    registrar.status('holygrail', block_identifier=7)
+    at_block.assert_called_once_with(7)
+
+
+@pytest.fixture
+def freshness(clock):
+    return FreshnessMonitor(allowable_delay=100, check_interval=10, clock=clock)
+
+
+@pytest.fixture
+def get_latest_block():
+    return Mock(return_value={'number': 5, 'timestamp': 0})
+
+
+def test_freshness_reuses_fresh_block(freshness, get_latest_block, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    freshness.assert_fresh(get_latest_block)
+    freshness.assert_fresh(get_latest_block)
+    assert get_latest_block.call_count == 1
+
+
+def test_freshness_rechecks_stale_once_per_interval(freshness, clock, get_latest_block, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=False)
+    for _ in range(2):
+        with pytest.raises(StaleBlockchain):
+            freshness.assert_fresh(get_latest_block)
+    assert get_latest_block.call_count == 1
+    clock.now += 10
+    with pytest.raises(StaleBlockchain):
+        freshness.assert_fresh(get_latest_block)
+    assert get_latest_block.call_count == 2
+
+
+def test_freshness_checks_after_observed_stale_block(freshness, get_latest_block, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=False)
+    freshness.observe({'number': 4, 'timestamp': 0})
+    with pytest.raises(StaleBlockchain):
+        freshness.assert_fresh(get_latest_block)
+    assert get_latest_block.call_count == 1
+    assert freshness.latest.number == 5
+
+
+def test_freshness_keeps_newest_block(freshness):
+    freshness.observe({'number': '0x6', 'timestamp': '0x10'})
+    freshness.observe({'number': 5, 'timestamp': 0})
+    assert freshness.latest.number == 6
+    assert freshness.latest.timestamp == 16
+
+
+def test_stalecheck_middleware(freshness, get_latest_block, mocker):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    web3 = Mock()
+    web3.eth.getBlock = get_latest_block
+    make_request = Mock()
+    checked_request = make_stalecheck_middleware(freshness)(make_request, web3)
+    checked_request('eth_call', [])
+    checked_request('eth_call', [])
+    get_latest_block.assert_called_once_with('latest')
+    assert make_request.call_count == 2
+
+
+def test_ens_shares_freshness_with_batches(ens, mocker, addr1):
+    mocker.patch.object(ens.freshness, 'due', return_value=False)
+    ens.freshness.observe({'number': 5, 'timestamp': 0})
+    batch_request = mocker.patch('ens.batch.batch_request', return_value=['0x'])
+    ens.address_many(['holy.eth'])
+    assert batch_request.call_args[0][2] is ens.freshness
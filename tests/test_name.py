@@ -0,0 +1,46 @@
+import pickle
+
+import pytest
+
+from ens import Name
+from ens.constants import EMPTY_SHA3_BYTES
+
+
+def test_name_normalized():
+    assert str(Name('Öbb')) == 'öbb.eth'
+    assert str(Name(b'grail.seeker.eth')) == 'grail.seeker.eth'
+    assert Name(Name('gallahad。eth')) == Name('gallahad')
+
+
+def test_name_labels():
+    assert Name('grail.seeker.eth').labels == ('grail', 'seeker', 'eth')
+
+
+def test_name_hashes_match_ens(ens):
+    name = Name('flying.circus.eth')
+    assert name.node == ens.namehash('flying.circus.eth')
+    assert name.parent_node == ens.namehash('circus.eth')
+    assert name.labelhashes == tuple(ens.labelhash(label) for label in name.labels)
+    assert Name('eth').parent_node == EMPTY_SHA3_BYTES
+
+
+def test_name_hashes_once(mocker):
+    name = Name('grail.seeker.eth')
+    hashes = (name.node, name.parent_node, name.labelhashes)
+    keccak = mocker.patch('ens.utils.keccak')
+    assert (name.node, name.parent_node, name.labelhashes) == hashes
+    assert not keccak.called
+
+
+def test_name_immutable():
+    name = Name('grail.eth')
+    with pytest.raises(AttributeError):
+        name._name = 'holy.grail.eth'
+    with pytest.raises(AttributeError):
+        name.extra = 'ni'
+
+
+def test_name_hashable_and_picklable():
+    name = Name('grail.eth')
+    assert {name: 1}[Name('grail')] == 1
+    assert pickle.loads(pickle.dumps(name)) == name
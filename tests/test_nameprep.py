@@ -1,7 +1,11 @@
 
+import random
+
+import idna
 import pytest
 
 from ens import InvalidName
+from ens.utils import PREPPED_ASCII_NAME
 
 # test content inspired by https://github.com/jcranmer/idna-uts46/blob/master/test/test-uts46.js
 
@@ -19,3 +23,41 @@ def test_nameprep_basic_unicode(ens):
 def test_nameprep_std3_rules(ens):
     with pytest.raises(InvalidName):
         ens.nameprep("not=std3")
+
+
+@pytest.mark.parametrize(
+    'name',
+    ['ethfinex.eth', 'a-b.c0.eth', '0x.eth', 'ab--c.eth', 'xn--bb-eka.at', 'a', 'Abc.eth', '-a.eth',
+     'a-.eth', 'a..eth', 'a.eth.', 'a_b.eth', ''],
+)
+def test_nameprep_ascii_fast_path(ens, mocker, name):
+    decode = mocker.patch('idna.decode', wraps=idna.decode)
+    try:
+        expected = idna.decode(name, uts46=True, std3_rules=True) if name else name
+    except idna.IDNAError:
+        expected = InvalidName
+    decode.reset_mock()
+
+    if expected is InvalidName:
+        with pytest.raises(InvalidName):
+            ens.nameprep(name)
+    else:
+        assert ens.nameprep(name) == expected
+        if PREPPED_ASCII_NAME.fullmatch(name):
+            assert name == expected
+            assert not decode.called
+
+
+def test_nameprep_ascii_fast_path_matches_idna():
+    rand = random.Random(0)
+    for _ in range(5000):
+        name = ''.join(rand.choice('ab0-.xnA_') for _ in range(rand.randint(1, 8)))
+        if PREPPED_ASCII_NAME.fullmatch(name):
+            assert idna.decode(name, uts46=True, std3_rules=True) == name
+
+
+def test_nameprep_cached(ens, mocker):
+    ens.nameprep('Öbb.at')
+    decode = mocker.patch('idna.decode')
+    assert ens.nameprep('Öbb.at') == 'öbb.at'
+    assert not decode.called
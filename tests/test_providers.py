@@ -0,0 +1,164 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+import os
+import socketserver
+import threading
+from unittest.mock import Mock
+
+import pytest
+from web3 import IPCProvider, Web3
+
+from ens.batch import batch_request
+from ens.providers import ConnectionPool, PooledHTTPProvider, PooledIPCProvider
+
+
+def respond(raw_request):
+    '@returns a JSON-RPC response with each method name as the result'
+    request = json.loads(raw_request.decode())
+    if isinstance(request, list):
+        return json.dumps([respond(json.dumps(each).encode()) for each in reversed(request)])
+    return {'jsonrpc': '2.0', 'id': request['id'], 'result': request['method']}
+
+
+def encode(response):
+    return (response if isinstance(response, str) else json.dumps(response)).encode()
+
+
+class JSONRPCHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        raw_request = self.rfile.read(int(self.headers['Content-Length']))
+        body = encode(respond(raw_request))
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class IPCHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            raw_request = self.request.recv(65536)
+            if not raw_request:
+                return
+            self.request.sendall(encode(respond(raw_request)))
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def http_endpoint():
+    server = serve(ThreadingHTTPServer(('127.0.0.1', 0), JSONRPCHandler))
+    yield 'http://127.0.0.1:%d' % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def ipc_path(tmpdir):
+    path = str(tmpdir.join('node.ipc'))
+    server = serve(ThreadingUnixServer(path, IPCHandler))
+    yield path
+    server.shutdown()
+    server.server_close()
+    os.remove(path)
+
+
+def test_pool_reuses_connections():
+    connect = Mock(side_effect=lambda: Mock())
+    pool = ConnectionPool(connect, size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert connect.call_count == 1
+
+
+def test_pool_opens_up_to_size():
+    connect = Mock(side_effect=lambda: Mock())
+    pool = ConnectionPool(connect, size=2)
+    with pool.connection() as first:
+        with pool.connection() as second:
+            assert second is not first
+    assert connect.call_count == 2
+
+
+def test_pool_waits_for_free_connection():
+    pool = ConnectionPool(Mock, size=1)
+    borrowed = []
+    with pool.connection():
+        waiting = threading.Thread(target=lambda: borrowed.append(pool.connection().__enter__()))
+        waiting.start()
+        waiting.join(0.1)
+        assert waiting.is_alive()
+    waiting.join(1)
+    assert len(borrowed) == 1
+
+
+def test_pool_closes_broken_connection():
+    connect = Mock(side_effect=lambda: Mock())
+    pool = ConnectionPool(connect, size=1)
+    with pytest.raises(IOError):
+        with pool.connection() as broken:
+            raise IOError
+    broken.close.assert_called_once_with()
+    with pool.connection() as replacement:
+        assert replacement is not broken
+
+
+def test_pooled_http_request(http_endpoint):
+    provider = PooledHTTPProvider(http_endpoint, pool_size=2)
+    assert provider.make_request('eth_blockNumber', [])['result'] == 'eth_blockNumber'
+
+
+def test_pooled_http_batch_request(http_endpoint):
+    provider = PooledHTTPProvider(http_endpoint)
+    responses = provider.make_batch_request([('eth_call', []), ('eth_blockNumber', [])])
+    assert [response['result'] for response in responses] == ['eth_call', 'eth_blockNumber']
+
+
+def test_pooled_ipc_request(ipc_path):
+    provider = PooledIPCProvider(ipc_path, pool_size=2)
+    assert provider.make_request('eth_blockNumber', [])['result'] == 'eth_blockNumber'
+    responses = provider.make_batch_request([('eth_call', []), ('eth_blockNumber', [])])
+    assert [response['result'] for response in responses] == ['eth_call', 'eth_blockNumber']
+
+
+def test_pooled_http_requests_from_threads(http_endpoint):
+    provider = PooledHTTPProvider(http_endpoint, pool_size=4)
+    results = []
+
+    def request():
+        results.append(provider.make_request('eth_chainId', [])['result'])
+
+    threads = [threading.Thread(target=request) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['eth_chainId'] * 16
+
+
+def test_ipc_provider_sends_batches(ipc_path, mocker):
+    provider = IPCProvider(ipc_path)
+    mocker.spy(provider, 'make_request')
+    freshness = Mock(unsafe=True, **{'due.return_value': False})
+    results = batch_request(Web3(provider), [('eth_call', []), ('eth_blockNumber', [])], freshness)
+    assert results == ['eth_call', 'eth_blockNumber']
+    assert not provider.make_request.called
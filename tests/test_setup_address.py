@@ -10,11 +10,38 @@ from ens.main import UnauthorizedError
 API at: https://github.com/carver/ens.py/issues/2
 '''
 
+ZERO_WORD = '0x' + '00' * 32
+
+
+def address_word(address):
+    return '0x' + '00' * 12 + address[2:] if address else ZERO_WORD
+
+
+def patch_owners(mocker, owner_of):
+    '''
+    Answer the batched registry calls of ENS._first_owner and ENS.ownership_chain, with
+    `owner_of(node)` as owner and nothing else set. The functions called are in `functions`.
+    '''
+    functions = []
+
+    def answer(web3, calls, block_identifier='latest', freshness=None):
+        calls = list(calls)
+        functions.extend(function for _, function, _ in calls)
+        return [
+            address_word(owner_of(node)) if function == 'owner' else ZERO_WORD
+            for _, function, node in calls
+        ]
+    mocker.patch('ens.main.can_batch', return_value=True)
+    batch = mocker.patch('ens.main.batch_node_calls', side_effect=answer)
+    batch.functions = functions
+    return batch
+
 
 @pytest.fixture
 def enssetter(ens, mocker, addr1, addr2, hash9):
     mocker.patch.object(ens.web3, 'eth', wraps=ens.web3.eth, accounts=[addr1, addr2])
     mocker.patch.object(ens, 'owner', return_value=addr1)
+    patch_owners(mocker, lambda node: addr1)
     mocker.patch.object(ens, 'address', return_value=None)
     mocker.patch.object(ens, '_resolverContract', return_value=Mock())
     mocker.patch.object(ens, '_first_owner', wraps=ens._first_owner)
@@ -82,13 +109,57 @@ def test_first_owner_label_to_name(enssetter, addr1):
 def test_first_owner_upchain_identify(enssetter, mocker, name1, addr1, addr2):
     # show the name as not set up
     # set_address should auto-select the name owner to send the transaction from
-    mocker.patch.object(
-        enssetter,
+    unowned_nodes = {
+        enssetter.namehash('abcdefg.bcdefgh.cdefghi.eth'),
+        enssetter.namehash('bcdefgh.cdefghi.eth'),
+    }
+    patch_owners(mocker, lambda node: None if node in unowned_nodes else addr2)
+    assert enssetter._first_owner('abcdefg.bcdefgh.cdefghi.eth') == \
+        (addr2, ['abcdefg', 'bcdefgh'], 'cdefghi.eth')
+
+
+def test_first_owner_none(enssetter, mocker):
+    patch_owners(mocker, lambda node: None)
+    assert enssetter._first_owner('abcdefg.eth') == (None, ['abcdefg', 'eth'], 'eth')
+
+
+def test_first_owner_hashes_once(enssetter, mocker, addr1):
+    owners = iter([None, None, addr1, None])
+    patch_owners(mocker, lambda node: next(owners))
+    mocker.patch.object(enssetter, 'labelhash', wraps=enssetter.labelhash)
+    enssetter._first_owner('abcdefg.bcdefgh.cdefghi.eth')
+    assert enssetter.labelhash.call_count == 4
+
+
+def test_first_owner_batches_owners(enssetter, mocker, addr1):
+    round_trips = patch_owners(mocker, lambda node: addr1)
+    enssetter._first_owner('abcdefg.bcdefgh.cdefghi.eth')
+    assert round_trips.call_count == 1
+    assert round_trips.functions == ['owner'] * 4
+
+
+def test_first_owner_unbatched_stops_at_owner(enssetter, mocker, addr2):
+    mocker.patch('ens.main.can_batch', return_value=False)
+    owned = enssetter.namehash('bcdefgh.cdefghi.eth')
+    owner = mocker.patch.object(
+        enssetter.ens,
         'owner',
-        side_effect=lambda name: None if len(name.split('.')) >= 3 else addr2
+        side_effect=lambda node: addr2 if node == owned else None,
     )
     assert enssetter._first_owner('abcdefg.bcdefgh.cdefghi.eth') == \
-        (addr2, ['abcdefg', 'bcdefgh'], 'cdefghi.eth')
+        (addr2, ['abcdefg'], 'bcdefgh.cdefghi.eth')
+    assert owner.call_count == 2
+
+
+def test_ownership_chain_one_round_trip(enssetter, mocker, addr1):
+    owned = enssetter.namehash('cdefghi.eth')
+    round_trips = patch_owners(mocker, lambda node: addr1 if node == owned else None)
+    chain = enssetter.ownership_chain('bcdefgh.cdefghi.eth')
+    assert round_trips.call_count == 1
+    assert [link.name for link in chain] == ['bcdefgh.cdefghi.eth', 'cdefghi.eth', 'eth']
+    assert [link.node for link in chain] == enssetter.namehash_chain('bcdefgh.cdefghi.eth')
+    assert [link.owner for link in chain] == [None, Web3.toChecksumAddress(addr1), None]
+    assert [(link.resolver, link.ttl) for link in chain] == [(None, 0)] * 3
 
 
 def test_claim_ownership_takeover_subdomains(enssetter, mocker, name1, addr1, addr2):
@@ -0,0 +1,101 @@
+import pytest
+
+from ens import ENS
+from ens.trace import Trace
+
+from .conftest import BatchProvider
+
+
+def tree(spans, depth=0):
+    for span in spans:
+        yield '  ' * depth + span.name
+        yield from tree(span.children, depth + 1)
+
+
+def test_trace_call_tree(provider):
+    ens = ENS(provider)
+    with ens.trace() as trace:
+        ens.address('holy.grail.eth')
+    assert list(tree(trace.spans)) == [
+        'ENS.address',
+        '  ENS.resolve',
+        '    ENS.resolver',
+        '      eth_getBlockByNumber',
+        '      eth_call',
+        '    eth_call',
+    ]
+    assert trace.spans[0].label == "ENS.address('holy.grail.eth')"
+    assert trace.spans[0].seconds >= trace.spans[0].children[0].seconds
+    assert not ens.observers
+
+
+def test_trace_started_mid_operation(provider, mocker):
+    ens = ENS(provider, stats=True)
+    namehash = ens.namehash
+    tracing = ens.trace()
+
+    def start_trace(name):
+        tracing.__enter__()
+        return namehash(name)
+    mocker.patch.object(ens, 'namehash', side_effect=start_trace)
+    ens.owner('holy.eth')
+    tracing.__exit__(None, None, None)
+    assert ens.stats.as_dict()['ENS.owner']['calls'] == 1
+    assert ens.observers == [ens.stats]
+
+
+def test_trace_finish_without_start():
+    trace = Trace()
+    trace.operation_finished('ENS.owner', 0.1, None)
+    assert trace.spans == []
+
+
+def test_trace_repeats(provider):
+    ens = ENS(provider, trace=True)
+    ens.owner('holy.eth')
+    ens.owner('holy.eth')
+    ens.owner('grail.eth')
+    repeats = ens.tracer.repeats()
+    assert [count for _, count in repeats] == [2, 2]
+    assert repeats[0][0] == "ENS.owner('holy.eth')"
+    assert repeats[1][0].startswith('eth_call(')
+    assert ens.tracer.render().count('(repeat #2)') == 2
+
+
+def test_trace_batch(mocker, addr9):
+    mocker.patch('web3.middleware.stalecheck._isfresh', return_value=True)
+    ens = ENS(BatchProvider(addr9))
+    with ens.trace() as trace:
+        ens.address_many(['holy.eth', 'grail.eth'])
+    batches = [span.label for span in trace.spans[0].children]
+    assert batches == [
+        'batch[eth_getBlockByNumber, eth_call, eth_call]',
+        'batch[eth_call, eth_call]',
+    ]
+
+
+def test_trace_error(provider, mocker):
+    ens = ENS(provider, trace=True)
+    mocker.patch.object(ens, 'namehash', side_effect=ValueError)
+    with pytest.raises(ValueError):
+        ens.owner('holy.eth')
+    assert isinstance(ens.tracer.spans[0].error, ValueError)
+    assert 'raised ValueError' in ens.tracer.render()
+
+
+def test_trace_folded(provider, tmpdir):
+    ens = ENS(provider, trace=True)
+    ens.address('holy.grail.eth')
+    path = str(tmpdir.join('trace.folded'))
+    ens.tracer.write_folded(path)
+    with open(path) as folded:
+        stacks = dict(line.rsplit(' ', 1) for line in folded.read().splitlines())
+    assert set(stacks) == {
+        'ENS.address',
+        'ENS.address;ENS.resolve',
+        'ENS.address;ENS.resolve;ENS.resolver',
+        'ENS.address;ENS.resolve;ENS.resolver;eth_getBlockByNumber',
+        'ENS.address;ENS.resolve;ENS.resolver;eth_call',
+        'ENS.address;ENS.resolve;eth_call',
+    }
+    assert all(microseconds.isdigit() for microseconds in stacks.values())
@@ -1,8 +1,124 @@
 
-from ens.utils import init_web3
+import threading
+from unittest.mock import Mock
+
+import pytest
+from web3 import Web3
+
+import ens as ens_package
+from ens import ENS, InvalidName
+from ens.constants import EMPTY_SHA3_BYTES
+from ens.utils import (
+    Lazy,
+    LRUCache,
+    init_web3,
+    label_to_hash,
+    labels_to_node,
+    namehash_many,
+)
 
 
 def test_init_adds_middlewares():
     w3 = init_web3()
     middlewares = map(str, w3.manager.middleware_stack)
     assert 'stalecheck_middleware' in next(middlewares)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_missing_default():
+    cache = LRUCache(1)
+    assert cache.get('missing') is None
+    assert cache.get('missing', 'default') == 'default'
+
+
+def test_lru_cache_shared_between_threads():
+    cache = LRUCache(10)
+
+    def churn(offset):
+        for key in range(offset, offset + 2000):
+            cache[key % 15] = key
+            cache.get((key + 7) % 15)
+            cache.pop((key + 3) % 15)
+
+    threads = [threading.Thread(target=churn, args=(offset, )) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) <= 10
+
+
+def test_lazy_builds_once_on_first_use():
+    factory = Mock(return_value=Mock(value=1))
+    lazy = Lazy(factory)
+    assert not factory.called
+    assert lazy.value == 1
+    lazy.value = 2
+    assert lazy.value == 2
+    assert factory.call_count == 1
+
+
+def test_lazy_builds_once_between_threads():
+    factory = Mock(side_effect=lambda: Mock())
+    lazy = Lazy(factory)
+    threads = [threading.Thread(target=lambda: lazy.value) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert factory.call_count == 1
+
+
+def test_module_ens_is_lazy():
+    assert type(ens_package.ens) is Lazy
+    assert isinstance(ens_package.ens, ENS)
+
+
+def test_namehash_many_matches_namehash(ens):
+    names = [
+        'grail.seeker.eth',
+        'seeker.eth',
+        'Öbb.eth',
+        'circus',
+        'gallahad。eth',
+        b'flying.circus.eth',
+        '',
+    ]
+    assert list(namehash_many(names)) == [ens.namehash(name) for name in names]
+
+
+def test_namehash_many_hashes_each_label_once(mocker):
+    keccak = mocker.patch('ens.utils.keccak', side_effect=lambda data: b'HASH(%s)' % data)
+    list(namehash_many(['a.foo.eth', 'b.foo.eth', 'a.bar.eth']))
+    # labels: a, foo, eth, b, bar -- nodes: eth, foo.eth, a.foo.eth, b.foo.eth, bar.eth, a.bar.eth
+    assert keccak.call_count == 5 + 6
+
+
+def test_namehash_many_invalid_name():
+    with pytest.raises(InvalidName):
+        list(namehash_many(['not=std3.eth']))
+
+
+@pytest.mark.parametrize('label', ['eth', 'öbb', ''])
+def test_label_to_hash_matches_web3_sha3(label):
+    expected = Web3.toBytes(hexstr=Web3.sha3(label.encode()))
+    assert label_to_hash(label) == expected
+
+
+def test_labels_to_node_matches_web3_sha3():
+    expected = EMPTY_SHA3_BYTES
+    for label in ['eth', 'circus', 'flying']:
+        labelhash = Web3.toBytes(hexstr=Web3.sha3(label.encode()))
+        expected = Web3.toBytes(hexstr=Web3.sha3(expected + labelhash))
+    assert labels_to_node(['flying', 'circus', 'eth'], LRUCache(4)) == expected